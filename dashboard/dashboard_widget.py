@@ -1,55 +1,54 @@
+import os
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
+from multiprocessing import AuthenticationError
+
 import ipywidgets as widgets
 import matplotlib.pyplot as plt
 import numpy as np
 
-# In order to use LaTeX to manage all text layout in our figures, we import rc settings from matplotlib.
-from matplotlib import rc
-
-rc("text", usetex=True)
-plt.rc("text", usetex=True)
-plt.rc("font", family="serif")
+# In order to use LaTeX to manage all text layout in our figures, we set matplotlib's rc settings (falling back to
+# matplotlib's mathtext if LaTeX is not installed). The labels on the figures are typeset once, when this module is
+# imported, and drawn from a cache of their outlines on every later render.
+from liqconstr import labels
+
+labels.use_tex()
+labels.warm(
+    [
+        r"$c$",
+        r"$w$",
+        r"$w^{\#}$",
+        r"$\hat{c}_{t,1}^{\#}$",
+        r"${c}_{t,1}^{\#}$",
+        r"$\hat{c}_{t,2}(w_{t,1})$",
+        r"$\hat{w}_{t,1}$",
+        r"$w_{t,1}$",
+        r"$\hat{w}_{t,2}$",
+        r"${w}_{t,1}$",
+        r"$\bar{w}_{t,1}$",
+    ]
+)
 
-# Now we can start making the figures.  We start by importing the relevant subclass of AgentType into our workspace.
+# The agents of each figure are declared as a reactive scenario: a base parameter set plus named variants, each a
+# function of the sliders it depends on. Moving one slider only solves and evaluates again the agents that depend on
+# it, and reuses the curves of the others from the previous render.
+from liqconstr.scenario import ReactiveScenario
 
-# Load consumer type from HARK
-from HARK.ConsumptionSaving.ConsIndShockModel import IndShockConsumerType
+# Where the constraints stop binding and where the consumption functions are defined follow from the parameters
+# alone, which lets the figures check before solving whether their kinks fall inside the plotted window
+from liqconstr import thresholds
 
-# Define all parameters of three type of settings that we need to produce the three figures in the paper.
+# The curves can be drawn at the resolution of the screen
+from dashboard.display import decimate
 
 # Common parameters for all models (the initialized lifecycle perfect foresight type with no borrowing constraint)
-
-# load default parameteres from the lifecycle model in the HARK toolbox
-from HARK.ConsumptionSaving.ConsIndShockModel import init_lifecycle
-
-# remove all risk and growth factors, borrowing constraints, and set the solver to always use the cubic tool
-init_lifecycle["PermGroFac"] = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-init_lifecycle["LivPrb"] = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-init_lifecycle["DiscFac"] = 1 / 1.03
-init_lifecycle["T_retire"] = 11
-init_lifecycle["UnempPrb"] = 0
-init_lifecycle["TranShkStd"] = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-init_lifecycle["PermShkStd"] = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-init_lifecycle["BoroCnstArt"] = [
-    None,
-    None,
-    None,
-    None,
-    None,
-    None,
-    None,
-    None,
-    None,
-    None,
-]
-init_lifecycle["CubicBool"] = False
+from liqconstr.parameters import init_lifecycle
 
 # add the second type of lifecycle agent with unemployment risk
 init_lifecycle_risk1 = dict(init_lifecycle)
 init_lifecycle_risk1["IncUnemp"] = 0.1955
 
-# the lifecycle type with only one-period transitory risk
-init_lifecycle_risk2 = dict(init_lifecycle)
-
 # Define a slider for the artificial borrowing constraint
 
 # Define default values for three different borrowind constraint widgets
@@ -97,6 +96,178 @@ TranShkStd_widget = widgets.FloatSlider(
 )
 
 
+# The solves behind the figures can be offloaded to worker processes, which exchange the wealth grid and the
+# consumption curves with this process through shared memory (see use_worker_processes)
+curve_pool = None
+
+
+def use_worker_processes(processes=1):
+    """
+    Offload the solves behind the dashboard figures to a pool of worker processes. The workers write the
+    consumption curves in place into shared memory, and the figures plot views of that memory directly.
+    Pass processes=0 to go back to solving in this process. Worker processes need Python 3.8 or later; with
+    an earlier Python (such as the 3.7 of the Binder environment) this warns and keeps solving in this process.
+    """
+    global curve_pool
+
+    # multiprocessing.shared_memory needs Python 3.8, so only import it when workers are requested
+    try:
+        from dashboard.shared_buffers import CurveWorkerPool
+    except ImportError as error:
+        warnings.warn(
+            "Worker processes need multiprocessing.shared_memory, new in Python 3.8 (%s); "
+            "solving in this process" % error
+        )
+        curve_pool = None
+        return
+
+    if curve_pool is not None:
+        curve_pool.close()
+    curve_pool = CurveWorkerPool(processes) if processes else None
+
+
+# The curves can instead be requested from a solve service shared by the kernels of several users, which
+# solves each slider configuration once for all of them (see use_solve_service and dashboard.solve_service)
+solve_service = None
+
+
+def use_solve_service(address=None, authkey=None):
+    """
+    Request the curves of the dashboard figures from the solve service at address ("HOST:PORT", by default
+    the service's default address), started with python -m dashboard.solve_service, with the key authkey (by
+    default the one the service wrote for this user, see dashboard.solve_service). Pass address=False to go back
+    to solving in this kernel.
+    """
+    global solve_service
+
+    from dashboard.solve_service import connect
+
+    solve_service = None if address is False else connect(address, authkey)
+
+
+# The curves can be reduced to the resolution of the screen, keeping the points next to their kinks, and stored in
+# single precision (see use_display_resolution and dashboard.display). None keeps every point of the grid.
+display_points = None
+display_dtype = np.float64
+
+
+def use_display_resolution(points=300, dtype=np.float32):
+    """
+    Draw the dashboard figures from about points points per curve (plus the points next to kinks) stored as dtype,
+    instead of from the full grid in double precision; the solve service then caches and sends the reduced curves.
+    Pass points=None to go back to the full grid.
+    """
+    global display_points, display_dtype
+
+    display_points = points
+    display_dtype = np.float64 if points is None else dtype
+
+
+def get_curves(curve_func, args, x, n_curves):
+    """
+    Evaluate curve_func(*args, x=x, out=...) either in this process or, if use_worker_processes has been
+    called, in a worker process via shared memory, or, if use_solve_service has been called, in the solve
+    service. Returns the wealth grid and the (n_curves, len(x)) array of curves, both reduced to the display
+    resolution if use_display_resolution has been called.
+    """
+    global solve_service
+
+    if solve_service is not None:
+        try:
+            return solve_service.curves(
+                curve_func.__name__,
+                args,
+                x,
+                n_curves,
+                display_points,
+                np.dtype(display_dtype).name,
+            )
+        except (OSError, EOFError) as error:
+            # The service has gone away: keep the dashboard working by solving in this kernel
+            warnings.warn("Solve service unavailable (%s); solving locally" % error)
+            solve_service = None
+
+    if curve_pool is None:
+        curves = curve_func(*args, x=x, out=np.empty((n_curves, len(x))))
+    else:
+        buffer = curve_pool.compute(curve_func, args, x, n_curves)
+        x, curves = buffer.x, buffer.curves
+    if display_points is None:
+        return x, curves
+    return decimate(x, curves, display_points, display_dtype)
+
+
+# The kernels of a multi-user deployment find the solve service through the environment
+if os.environ.get("LIQCONSTR_SOLVE_SERVICE"):
+    try:
+        use_solve_service(os.environ["LIQCONSTR_SOLVE_SERVICE"])
+    except (OSError, AuthenticationError) as error:
+        warnings.warn("Solve service unavailable (%s); solving locally" % error)
+
+
+def first_close(x, y1, y2, start=-np.inf, atol=1e-08):
+    """
+    Return the index of the first point of the wealth grid x, at or above start, at which the curves y1 and y2
+    coincide, or None if they do not coincide anywhere on that part of the grid.
+    """
+    where_close = np.isclose(y1, y2, atol=atol) & (x >= start)
+    if not np.any(where_close):
+        return None
+    return np.argmax(where_close)
+
+
+def in_window(x, window):
+    return x is not None and window[0] <= x <= window[1]
+
+
+def show_out_of_range(message):
+    """
+    Display an empty figure that explains why there is nothing to plot for the current slider values.
+    """
+    f = plt.figure()
+    plt.axis("off")
+    plt.text(0.5, 0.5, message, ha="center", va="center", fontsize=12)
+    plt.show()
+    return None
+
+
+def concavification_constraint(BoroCnstArt):
+    BoroCnstArt = [None, BoroCnstArt, None, None, None, None, None, None, None, None]
+    return {"BoroCnstArt": BoroCnstArt}
+
+
+def concavification_risk(UnempPrb):
+    return dict(init_lifecycle_risk1, UnempPrb=UnempPrb)
+
+
+# the three agents: unconstrained perfect foresight, constrained perfect foresight, unconstrained with risk, each with
+# the sliders it depends on
+CCC = ReactiveScenario(
+    init_lifecycle,
+    [
+        ("unconstr", ((), dict)),
+        ("constraint", (("BoroCnstArt",), concavification_constraint)),
+        ("risk", (("UnempPrb",), concavification_risk)),
+    ],
+    period=0,
+)
+
+
+# the wealth grid of the figure
+concavification_grid = np.linspace(-1, 1, 500, endpoint=True)
+
+
+def concavification_curves(in_BoroCnstArt, in_UnempProb, x, out):
+    """
+    Solve the three agents of the concavification figure and write their period 0 consumption functions,
+    evaluated on the wealth grid x, into the rows of out: unconstrained perfect foresight, constrained perfect
+    foresight, and unconstrained with risk. Only the agents that depend on a slider that moved are solved again.
+    """
+    values = {"BoroCnstArt": in_BoroCnstArt, "UnempPrb": in_UnempProb}
+    out[:] = CCC.evaluate(values, x).values
+    return out
+
+
 def make_concavification_figure(in_BoroCnstArt, in_UnempProb):
     """
     This figure illustrates how both risks and constraints are examples of counterclockwise concavifications.
@@ -104,44 +275,12 @@ def make_concavification_figure(in_BoroCnstArt, in_UnempProb):
     function of a consumer who faces a constraint, and the curved consumption function of a consumer that faces risk.
     """
 
-    # load the three agents: unconstrained perfect foresight, constrained perfect foresight, unconstrained with risk
-
-    CCC_unconstr = IndShockConsumerType(**init_lifecycle)
-    CCC_unconstr.delFromTimeInv("BoroCnstArt")
-    CCC_unconstr.addToTimeVary("BoroCnstArt")
-    CCC_unconstr.solve()
-    CCC_unconstr.unpack("cFunc")
-
-    CCC_constraint = IndShockConsumerType(**init_lifecycle)
-    CCC_constraint.delFromTimeInv("BoroCnstArt")
-    CCC_constraint.addToTimeVary("BoroCnstArt")
-    CCC_constraint.BoroCnstArt = [
-        None,
-        in_BoroCnstArt,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-    ]
-    CCC_constraint.solve()
-    CCC_constraint.unpack("cFunc")
-
-    init_lifecycle_risk1["UnempPrb"] = in_UnempProb
-
-    CCC_risk = IndShockConsumerType(**init_lifecycle_risk1)
-    CCC_risk.delFromTimeInv("BoroCnstArt")
-    CCC_risk.addToTimeVary("BoroCnstArt")
-    CCC_risk.solve()
-    CCC_risk.unpack("cFunc")
-
-    x = np.linspace(-1, 1, 500, endpoint=True)
-    y = CCC_unconstr.cFunc[0](x)
-    y2 = CCC_constraint.cFunc[0](x)
-    y3 = CCC_risk.cFunc[0](x)
+    x, (y, y2, y3) = get_curves(
+        concavification_curves,
+        (in_BoroCnstArt, in_UnempProb),
+        concavification_grid,
+        3,
+    )
 
     where_close = np.isclose(y, y2, atol=1e-05)
 
@@ -163,11 +302,11 @@ def make_concavification_figure(in_BoroCnstArt, in_UnempProb):
     if np.any(where_close):
         x0 = x[where_close][0]
         y0 = y[where_close][0]
-        plt.text(x0 - 0.02, 0.42, "$w^{\#}$", fontsize=14)
+        labels.text(x0 - 0.02, 0.42, "$w^{\#}$", fontsize=14)
         plt.plot([x0, x0], [0.45, y0], color="black", linestyle=":", linewidth=1)
 
-    plt.text(-1.2, 1.0, "$c$", fontsize=14)
-    plt.text(1.12, 0.42, "$w$", fontsize=14)
+    labels.text(-1.2, 1.0, "$c$", fontsize=14)
+    labels.text(1.12, 0.42, "$w$", fontsize=14)
     plt.ylim(0.465, 1.0)
 
     plt.legend()
@@ -175,6 +314,43 @@ def make_concavification_figure(in_BoroCnstArt, in_UnempProb):
     return None
 
 
+def future_kink_constraints(BoroCnstArt=None):
+    BoroCnstArt = [None, 0, BoroCnstArt, None, None, None, None, None, None, None]
+    return {"BoroCnstArt": BoroCnstArt}
+
+
+# the consumer with only one borrowing constraint and the consumer with more than one binding borrowing constraint,
+# each with the sliders it depends on
+Bcons = ReactiveScenario(
+    init_lifecycle,
+    [
+        ("Bcons1", ((), future_kink_constraints)),
+        ("BCons2", (("BoroCnstArt",), future_kink_constraints)),
+    ],
+    period=0,
+)
+
+
+# the wealth grid of the figure
+future_kink_grid = np.linspace(1, 1.2, 500, endpoint=True)
+
+
+def future_kink_curves(in_BoroCnstArt, x, out):
+    """
+    Solve the two perfect foresight agents of the future kink figure and write their period 0 consumption
+    functions, evaluated on the wealth grid x, into the first two rows of out: one constraint in period 2, and the
+    same constraint plus one more in period 3. The last two rows get the curvature of the same two functions.
+
+    Both consumption functions first loads the parameter set of the perfect foresight lifecycle households with ten periods.
+    We then change the parameter "BoroCnstArt" which corresponds to big Tau in the paper, i.e. the set of future constraints ordered by time.
+    Only the second consumer depends on the slider, so the first is solved once.
+    """
+    values = {"BoroCnstArt": in_BoroCnstArt}
+    out[:2] = Bcons.evaluate(values, x).values
+    out[2:] = Bcons.evaluate(values, x, kind="curvature").values
+    return out
+
+
 def make_future_kink(in_BoroCnstArt):
     """
     This figure illustrates how a the introduction of a current constraint can hide/move a kink that was induced by a future constraint.
@@ -182,53 +358,26 @@ def make_future_kink(in_BoroCnstArt):
     To construct this figure, we plot two consumption functions:
     1) perfect foresight consumer that faces one constraint in period 2
     2) perfect foresight consumer that faces the same constraint as above plus one more constraint in period 3
-
-    Both consumption functions first loads the parameter set of the perfect foresight lifecycle households with ten periods.
-    We then change the parameter "BoroCnstArt" which corresponds to big Tau in the paper, i.e. the set of future constraints ordered by time.
     """
 
-    # Make and solve the consumer with only one borrowing constraint
-    Bcons1 = IndShockConsumerType(**init_lifecycle)
-    Bcons1.delFromTimeInv("BoroCnstArt")
-    Bcons1.addToTimeVary("BoroCnstArt")
-    Bcons1.BoroCnstArt = [None, 0, None, None, None, None, None, None, None, None]
-    Bcons1.solve()
-    Bcons1.unpack("cFunc")
-
-    # Make and solve the consumer with more than one binding borrowing constraint
-    BCons2 = IndShockConsumerType(**init_lifecycle)
-    BCons2.delFromTimeInv("BoroCnstArt")
-    BCons2.addToTimeVary("BoroCnstArt")
-    BCons2.BoroCnstArt = [
-        None,
-        0,
-        in_BoroCnstArt,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-    ]
-    BCons2.solve()
-    BCons2.unpack("cFunc")
-
-    x = np.linspace(1, 1.2, 500, endpoint=True)
-    y_mod1 = Bcons1.cFunc[0](x)
-    y_mod2 = BCons2.cFunc[0](x)
+    grid = future_kink_grid
+    x, (y_mod1, y_mod2, y1dd, y2dd) = get_curves(
+        future_kink_curves, (in_BoroCnstArt,), grid, 4
+    )
 
-    where_close = np.isclose(y_mod1, y_mod2)
-    x0 = x[where_close][0]
-    y0 = y_mod1[where_close][0]
+    # the consumption functions coincide above the level of wealth where the constraints stop binding
+    i0 = first_close(x, y_mod1, y_mod2)
+    if i0 is not None:
+        x0 = x[i0]
+        y0 = y_mod1[i0]
 
-    y1dd = np.diff(y_mod1, n=2)
-    ind1 = np.argmin(y1dd[:250]) + 1
+    # the kinks are where the consumption functions are most concave, in the left half of the grid
+    left = x <= (grid[250] + grid[251]) / 2
+    ind1 = np.argmin(np.where(left, y1dd, np.inf))
     x1 = x[ind1]
     y1 = y_mod1[ind1]
 
-    y2dd = np.diff(y_mod2, n=2)
-    ind2 = np.argmin(y2dd[:250]) + 1
+    ind2 = np.argmin(np.where(left, y2dd, np.inf))
     x2 = x[ind2]
     y2 = y_mod2[ind2]
 
@@ -254,12 +403,13 @@ def make_future_kink(in_BoroCnstArt):
         top="off",
     )
 
-    plt.text(0.99, 1.025, "$c$", fontsize=14)
-    plt.text(1.20, 0.978, "$w$", fontsize=14)
+    labels.text(0.99, 1.025, "$c$", fontsize=14)
+    labels.text(1.20, 0.978, "$w$", fontsize=14)
 
-    plt.text(0.988, y0, "$\hat{c}_{t,1}^{\#}$", fontsize=14)
-    plt.text(0.988, y1 + 0.0015, "${c}_{t,1}^{\#}$", fontsize=14)
-    plt.text(0.97, y2 - 0.0015, "$\hat{c}_{t,2}(w_{t,1})$", fontsize=14)
+    if i0 is not None:
+        labels.text(0.988, y0, "$\hat{c}_{t,1}^{\#}$", fontsize=14)
+    labels.text(0.988, y1 + 0.0015, "${c}_{t,1}^{\#}$", fontsize=14)
+    labels.text(0.97, y2 - 0.0015, "$\hat{c}_{t,2}(w_{t,1})$", fontsize=14)
 
     plt.annotate(
         "kink that \n gets hidden",
@@ -268,15 +418,16 @@ def make_future_kink(in_BoroCnstArt):
         arrowprops=dict(facecolor="black", headwidth=4, width=1, shrink=0.15),
     )
 
-    plt.text(x0 - 0.005, 0.977, "$\hat{w}_{t,1}$", fontsize=14)
-    plt.text(x1 - 0.005, 0.977, "$w_{t,1}$", fontsize=14)
-    plt.text(x2 - 0.01, 0.975, "$\hat{w}_{t,2}$", fontsize=14)
+    labels.text(x1 - 0.005, 0.977, "$w_{t,1}$", fontsize=14)
+    labels.text(x2 - 0.01, 0.975, "$\hat{w}_{t,2}$", fontsize=14)
 
-    plt.plot([1, x0], [y0, y0], color="black", linestyle="--")
     plt.plot([1, x1], [y1, y1], color="black", linestyle="--")
     plt.plot([1, x2], [y2, y2], color="black", linestyle="--")
 
-    plt.plot([x0, x0], [0.98, y0], color="black", linestyle="--")
+    if i0 is not None:
+        labels.text(x0 - 0.005, 0.977, "$\hat{w}_{t,1}$", fontsize=14)
+        plt.plot([1, x0], [y0, y0], color="black", linestyle="--")
+        plt.plot([x0, x0], [0.98, y0], color="black", linestyle="--")
     plt.plot([x1, x1], [0.98, y1], color="black", linestyle="--")
     plt.plot([x2, x2], [0.98, y2], color="black", linestyle="--")
 
@@ -285,6 +436,96 @@ def make_future_kink(in_BoroCnstArt):
     return None
 
 
+def cons_func_constraint(BoroCnstArt):
+    return [None, None, BoroCnstArt, None, None, None, None, None, None, None]
+
+
+def cons_func_risk(TranShkStd):
+    return [0, TranShkStd, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+
+
+# the four agents of the figure with and without a constraint and a risk, each with the sliders it depends on
+WwCR = ReactiveScenario(
+    init_lifecycle,
+    [
+        ("unconstr", ((), dict)),
+        (
+            "risk",
+            (
+                ("TranShkStd",),
+                lambda TranShkStd: {"TranShkStd": cons_func_risk(TranShkStd)},
+            ),
+        ),
+        (
+            "constr",
+            (
+                ("BoroCnstArt",),
+                lambda BoroCnstArt: {"BoroCnstArt": cons_func_constraint(BoroCnstArt)},
+            ),
+        ),
+        (
+            "constr_risk",
+            (
+                ("BoroCnstArt", "TranShkStd"),
+                lambda BoroCnstArt, TranShkStd: {
+                    "TranShkStd": cons_func_risk(TranShkStd),
+                    "BoroCnstArt": cons_func_constraint(BoroCnstArt),
+                },
+            ),
+        ),
+    ],
+    period=1,
+)
+
+
+# the wealth grid of the figure
+cons_func_grid = np.linspace(-8, -4, 1000, endpoint=True)
+
+
+def cons_func_variants(in_BoroCnstArt, in_TranShkStd):
+    """
+    The four agents of the figure with and without a constraint and a risk, as variants of init_lifecycle:
+    unconstrained perfect foresight, unconstrained with risk, constrained perfect foresight, and constrained with risk.
+    """
+    return WwCR.variants({"BoroCnstArt": in_BoroCnstArt, "TranShkStd": in_TranShkStd})
+
+
+@lru_cache(maxsize=1024)
+def cons_func_ranges(in_BoroCnstArt, in_TranShkStd):
+    """
+    Predict from the parameters alone, without solving, where the features of the figure with and without a
+    constraint and a risk lie: the wealth omega above which the constraint stops binding for the perfect foresight
+    consumer (the constrained consumer with risk leaves the constraint at even higher wealth), and the lowest wealth
+    at which each of the four consumption functions is defined.
+    """
+    variants = cons_func_variants(in_BoroCnstArt, in_TranShkStd)
+    omega = thresholds.omega(dict(init_lifecycle, **variants["constr"]), 1)
+    lowest = tuple(
+        thresholds.lowest_resources(dict(init_lifecycle, **variant), 1)
+        for variant in variants.values()
+    )
+    return omega, lowest
+
+
+def cons_func_curves(in_BoroCnstArt, in_TranShkStd, x, out):
+    """
+    Solve the four agents of the figure with and without a constraint and a risk and write their period 1
+    consumption functions, evaluated on the wealth grid x, into the rows of out: unconstrained perfect foresight,
+    unconstrained with risk, constrained perfect foresight, and constrained with risk. Agents whose consumption
+    function is not defined anywhere on the grid are not solved, and their rows are NaN; only the agents that
+    depend on a slider that moved are solved again.
+    """
+
+    _, lowest = cons_func_ranges(in_BoroCnstArt, in_TranShkStd)
+    rows = [row for row, m in enumerate(lowest) if m < x[-1]]
+
+    out[:] = np.nan
+    if rows:
+        values = {"BoroCnstArt": in_BoroCnstArt, "TranShkStd": in_TranShkStd}
+        out[rows] = WwCR.evaluate(values, x, [WwCR.labels[row] for row in rows]).values
+    return out
+
+
 def make_cons_func(in_BoroCnstArt, in_TranShkStd):
     """
     This figure illustrates how the effect of risk is greater if there already exists a constraint.
@@ -292,69 +533,37 @@ def make_cons_func(in_BoroCnstArt, in_TranShkStd):
     Initialize four types: unconstrained perfect foresight, unconstrained with risk, constrained perfect foresight, and constrained with risk.
     """
 
-    WwCR_unconstr = IndShockConsumerType(**init_lifecycle)
-    WwCR_unconstr.delFromTimeInv("BoroCnstArt")
-    WwCR_unconstr.addToTimeVary("BoroCnstArt")
-    WwCR_unconstr.solve()
-    WwCR_unconstr.unpack("cFunc")
-
-    init_lifecycle_risk2["TranShkStd"] = [0, in_TranShkStd, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-
-    WwCR_risk = IndShockConsumerType(**init_lifecycle_risk2)
-    WwCR_risk.delFromTimeInv("BoroCnstArt")
-    WwCR_risk.addToTimeVary("BoroCnstArt")
-    WwCR_risk.solve()
-    WwCR_risk.unpack("cFunc")
-
-    WwCR_constr = IndShockConsumerType(**init_lifecycle)
-    WwCR_constr.cycles = 1  # Make this consumer live a sequence of periods exactly once
-    WwCR_constr.delFromTimeInv("BoroCnstArt")
-    WwCR_constr.addToTimeVary("BoroCnstArt")
-    WwCR_constr.BoroCnstArt = [
-        None,
-        None,
-        in_BoroCnstArt,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-    ]
-    WwCR_constr.solve()
-    WwCR_constr.unpack("cFunc")
-
-    WwCR_constr_risk = IndShockConsumerType(**init_lifecycle_risk2)
-    WwCR_constr_risk.delFromTimeInv("BoroCnstArt")
-    WwCR_constr_risk.addToTimeVary("BoroCnstArt")
-    WwCR_constr_risk.BoroCnstArt = [
-        None,
-        None,
-        in_BoroCnstArt,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-    ]
-    WwCR_constr_risk.solve()
-    WwCR_constr_risk.unpack("cFunc")
-
-    x = np.linspace(-8, -4, 1000, endpoint=True)
-    y = WwCR_unconstr.cFunc[1](x)
-    y2 = WwCR_risk.cFunc[1](x)
-    y3 = WwCR_constr.cFunc[1](x)
-    y4 = WwCR_constr_risk.cFunc[1](x)
-
-    where_close = np.isclose(y, y3, atol=1e-05)
-    where_close_risk = np.isclose(y2, y4, atol=1e-05)
-    x0 = x[where_close][0]
-    x1 = x[where_close_risk][0]
-    y0 = y[where_close][0]
-    y1 = y2[where_close_risk][0]
+    window = (-8, -4.5)
+    omega, lowest = cons_func_ranges(in_BoroCnstArt, in_TranShkStd)
+    if min(lowest) >= window[1]:
+        return show_out_of_range(
+            "None of the consumption functions is defined at the plotted levels of wealth."
+        )
+
+    x, (y, y2, y3, y4) = get_curves(
+        cons_func_curves,
+        (in_BoroCnstArt, in_TranShkStd),
+        cons_func_grid,
+        4,
+    )
+
+    # The constrained and unconstrained consumption functions coincide above the wealth where the constraint stops
+    # binding, which with risk is above the level omega predicted for perfect foresight. If omega is already to the
+    # right of the window, neither point can be shown and neither is looked for.
+    i0, i1 = None, None
+    if omega <= window[1]:
+        i0 = first_close(x, y, y3, atol=1e-05)
+        i1 = first_close(
+            x, y2, y4, start=x[i0] if i0 is not None else omega, atol=1e-05
+        )
+    show0 = i0 is not None and in_window(x[i0], window)
+    show1 = i1 is not None and in_window(x[i1], window)
+    if show0:
+        x0 = x[i0]
+        y0 = y[i0]
+    if show1:
+        x1 = x[i1]
+        y1 = y2[i1]
 
     # Display the figure
     # print('Figure 3: Consumption Functions With and Without a Constraint and a Risk')
@@ -368,16 +577,17 @@ def make_cons_func(in_BoroCnstArt, in_TranShkStd):
     plt.plot(x, y4, color="red", linestyle="--", label=r"$\tilde{c}_{t,1}$")
     plt.xlim(left=-8, right=-4.5)
     plt.ylim(0, 0.30)
-    plt.text(-8.15, 0.305, "$c$", fontsize=14)
-    plt.text(-4.5, -0.02, "$w$", fontsize=14)
+    labels.text(-8.15, 0.305, "$c$", fontsize=14)
+    labels.text(-4.5, -0.02, "$w$", fontsize=14)
 
     # plt.plot([-6.15,-6.15],[0,0.05],color="black",linestyle=":")
-    plt.plot([x0, x0], [0, y0], color="black", linestyle=":")
-    plt.plot([x1, x1], [0, y1], color="black", linestyle=":")
-
     # plt.text(-6.2,-0.02,r"$\underline{w}_{t,1}$",fontsize=14)
-    plt.text(x0, -0.02, r"${w}_{t,1}$", fontsize=14)
-    plt.text(x1, -0.02, r"$\bar{w}_{t,1}$", fontsize=14)
+    if show0:
+        plt.plot([x0, x0], [0, y0], color="black", linestyle=":")
+        labels.text(x0, -0.02, r"${w}_{t,1}$", fontsize=14)
+    if show1:
+        plt.plot([x1, x1], [0, y1], color="black", linestyle=":")
+        labels.text(x1, -0.02, r"$\bar{w}_{t,1}$", fontsize=14)
 
     plt.tick_params(
         labelbottom=False,
@@ -390,3 +600,93 @@ def make_cons_func(in_BoroCnstArt, in_TranShkStd):
     plt.legend()
     plt.show()
     return None
+
+
+# The reactive scenario, the wealth grid and the sliders of each figure, by input name, over whose ranges the
+# consumption functions of the figure can be solved ahead of time into an archive (see write_sweep and use_archive)
+sweeps = OrderedDict(
+    [
+        (
+            "concavification",
+            (
+                CCC,
+                concavification_grid,
+                OrderedDict(
+                    [
+                        ("BoroCnstArt", BoroCnstArt_widget[0]),
+                        ("UnempPrb", UnempProb_widget),
+                    ]
+                ),
+            ),
+        ),
+        (
+            "future_kink",
+            (
+                Bcons,
+                future_kink_grid,
+                OrderedDict([("BoroCnstArt", BoroCnstArt_widget[1])]),
+            ),
+        ),
+        (
+            "cons_func",
+            (
+                WwCR,
+                cons_func_grid,
+                OrderedDict(
+                    [
+                        ("BoroCnstArt", BoroCnstArt_widget[2]),
+                        ("TranShkStd", TranShkStd_widget),
+                    ]
+                ),
+            ),
+        ),
+    ]
+)
+
+
+def slider_values(widget, steps):
+    """
+    The positions of a dashboard slider from its minimum to its maximum, rounded to its step.
+    """
+    values = np.linspace(widget.min, widget.max, steps)
+    return np.round(np.round(values / widget.step) * widget.step, 10).tolist()
+
+
+def write_sweep(name, path, steps=25, periods=None, dtype=np.float64, jobs=1):
+    """
+    Solve the agents of the figure name (a key of sweeps) at steps positions of each of its sliders, every
+    combination of them, and write their consumption functions in the given periods (by default all of them),
+    evaluated on the figure's wealth grid, to an archive in the directory path (see liqconstr.archive).
+    """
+    from liqconstr.archive import write_archive
+
+    reactive, grid, sliders = sweeps[name]
+    inputs = OrderedDict(
+        (input, slider_values(widget, steps)) for input, widget in sliders.items()
+    )
+    return write_archive(
+        path, reactive, inputs, grid, periods, name=name, dtype=dtype, jobs=jobs
+    )
+
+
+def use_archive(path):
+    """
+    Read the consumption functions of a figure from the archive in the directory path, written by write_sweep
+    (or python -m liqconstr archive), at the slider positions it holds, instead of solving them in this process;
+    the figure solves its agents at the other positions as before. Returns the Archive. Raises ValueError if the
+    archive was written by another solver, for agents with other parameters or on another wealth grid than
+    the figure's (see Archive.check).
+    """
+    from liqconstr.archive import Archive
+
+    archive = Archive(path)
+    if archive.name not in sweeps:
+        raise ValueError(
+            "Archive %s is not a sweep of a dashboard figure (%s)"
+            % (path, ", ".join(sweeps))
+        )
+    reactive, grid, _ = sweeps[archive.name]
+    archive.check(reactive, grid)
+    reactive.archive = archive
+    reactive.clear()
+    return archive
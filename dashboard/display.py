@@ -0,0 +1,63 @@
+"""
+Curves of the dashboard at the resolution of the screen.
+
+The dashboard evaluates its consumption functions on grids of 500 to 1000 points, more than
+the figures are wide in pixels. decimate() keeps about as many of them as the figure can
+show, evenly spaced, plus every point next to a kink or to where two curves meet, so that the
+omega points (and the points where a consumption function starts being defined) are drawn and
+labelled exactly where they are at full resolution, and optionally stores the result in single
+precision. Curves decimated this way take a fraction of the memory of the full grid wherever
+they are cached or sent between processes.
+"""
+
+import numpy as np
+
+# Changes in slope between neighbouring grid cells above this are kinks. A binding constraint
+# changes the slope of a consumption function by 0.1 or more, while the changes between the
+# cells of a smooth (risky) consumption function are of the order of the grid spacing.
+kink_tol = 0.01
+
+# Two curves meet where they become equal within these absolute tolerances (as in np.isclose),
+# those with which the figures look for the omega points
+meet_atols = (1e-08, 1e-05)
+
+
+def decimate(x, curves, points, dtype=np.float64, tol=None):
+    """
+    Return the wealth grid x and the (n_curves, len(x)) array of curves evaluated on it, reduced
+    to about points evenly spaced points plus the points next to kinks, to the points where two
+    curves meet and to the edges of the region where a curve is defined, as arrays of dtype.
+    With points=None the full grid is kept.
+    """
+    if tol is None:
+        tol = kink_tol
+    x = np.asarray(x)
+    curves = np.asarray(curves)
+    if points is None or len(x) <= points:
+        return x.astype(dtype, copy=False), curves.astype(dtype, copy=False)
+
+    keep = np.zeros(len(x), dtype=bool)
+    keep[np.round(np.linspace(0, len(x) - 1, points)).astype(int)] = True
+
+    # A kink between two grid points changes the slopes of the cells on either side of it: keep
+    # both cells, so that the corner is drawn as at full resolution
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slopes = np.diff(curves, axis=1) / np.diff(x)
+        jumps = np.abs(np.diff(slopes, axis=1)) > tol
+    kinks = np.flatnonzero(jumps.any(axis=0)) + 1
+    for offset in (-1, 0, 1):
+        keep[kinks + offset] = True
+
+    # The last missing and first defined point (or the reverse) of each curve, and the last
+    # point before and the first point at which two curves are equal (or the reverse)
+    changes = [np.isnan(curves)]
+    for i in range(len(curves)):
+        for j in range(i + 1, len(curves)):
+            for atol in meet_atols:
+                changes.append(np.isclose(curves[i], curves[j], atol=atol)[np.newaxis])
+    changes = np.concatenate(changes)
+    edges = np.flatnonzero((changes[:, 1:] != changes[:, :-1]).any(axis=0))
+    keep[edges] = True
+    keep[edges + 1] = True
+
+    return x[keep].astype(dtype), curves[:, keep].astype(dtype)
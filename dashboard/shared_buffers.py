@@ -0,0 +1,126 @@
+"""
+Shared-memory transport for the curves drawn by the dashboard.
+
+When the dashboard callbacks are offloaded to worker processes, the wealth grid and the
+consumption functions evaluated on it are exchanged through blocks of shared memory instead
+of being pickled back and forth on every slider event. The front end owns one block per
+kind of figure; a worker attaches to it by name, writes its results in place, and the front
+end hands numpy views of the block straight to matplotlib.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedCurveBuffer:
+    """
+    A block of shared memory holding a wealth grid `x` with n_points entries and an array
+    `curves` of shape (n_curves, n_points) evaluated on that grid. Both are numpy views of
+    the block, so reading them does not copy anything.
+
+    The process that creates a buffer (name=None) owns it and should eventually call
+    unlink(); other processes attach to an existing block by passing its name.
+    """
+
+    def __init__(self, n_points, n_curves, name=None):
+        size = (n_curves + 1) * n_points * np.dtype(np.float64).itemsize
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.n_points = n_points
+        self.n_curves = n_curves
+        data = np.ndarray(
+            (n_curves + 1, n_points), dtype=np.float64, buffer=self.shm.buf
+        )
+        self.x = data[0]
+        self.curves = data[1:]
+
+    @property
+    def spec(self):
+        """
+        A small picklable description (name, n_points, n_curves) from which another
+        process can attach to this buffer.
+        """
+        return (self.shm.name, self.n_points, self.n_curves)
+
+    def close(self):
+        """
+        Release this process's mapping of the block. Views still held elsewhere (e.g. by
+        matplotlib lines) keep the mapping alive until they are garbage collected.
+        """
+        self.x = None
+        self.curves = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+
+    def unlink(self):
+        """
+        Destroy the underlying block once every process is done with it.
+        """
+        self.shm.unlink()
+
+
+# Buffers a worker process has already attached to, keyed by block name, so that repeated
+# slider events reuse the same mapping
+_attached = {}
+
+
+def _attach(spec):
+    name, n_points, n_curves = spec
+    buffer = _attached.get(name)
+    if buffer is None:
+        buffer = SharedCurveBuffer(n_points, n_curves, name=name)
+        _attached[name] = buffer
+    return buffer
+
+
+def _fill(spec, func, args):
+    # Runs in the worker: evaluate the curves directly into the shared block
+    buffer = _attach(spec)
+    func(*args, x=buffer.x, out=buffer.curves)
+
+
+class CurveWorkerPool:
+    """
+    A pool of worker processes that evaluate dashboard curves into shared memory.
+
+    compute() takes a module-level function with signature func(*args, x, out), which must
+    fill out[i] with the i-th curve evaluated on x. One SharedCurveBuffer is kept per
+    function and grid size and reused across calls, so nothing is allocated or serialized
+    per slider event beyond the function reference and its scalar arguments.
+    """
+
+    def __init__(self, processes=1):
+        self.executor = ProcessPoolExecutor(max_workers=processes)
+        self.buffers = {}
+
+    def compute(self, func, args, x, n_curves):
+        """
+        Evaluate func(*args) on the grid x in a worker process and return the shared
+        buffer holding the result. The call blocks until the worker is done, so the
+        buffer's views are safe to read (and are overwritten by the next call with the
+        same func and grid size).
+        """
+        key = (func.__module__, func.__qualname__, len(x), n_curves)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = SharedCurveBuffer(len(x), n_curves)
+            self.buffers[key] = buffer
+        buffer.x[:] = x
+        self.executor.submit(_fill, buffer.spec, func, args).result()
+        return buffer
+
+    def close(self):
+        """
+        Shut down the workers and destroy all shared buffers.
+        """
+        self.executor.shutdown()
+        for buffer in self.buffers.values():
+            buffer.close()
+            buffer.unlink()
+        self.buffers = {}
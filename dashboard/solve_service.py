@@ -0,0 +1,264 @@
+"""
+A solve service shared by the kernels of several dashboard users.
+
+When the dashboard is served to many users at once (e.g. a classroom on Binder or Voila),
+every kernel would otherwise solve the same agents for the same slider positions. Instead,
+one process runs the service, which owns a cache of the curves drawn by the dashboard keyed
+by the curve function, the slider values and the wealth grid, and the kernels ask it for
+their curves over a local socket (a multiprocessing manager). A request for curves that are
+being computed for another kernel waits for that computation instead of starting its own,
+so each slider configuration is solved once however many users select it. Kernels that call
+dashboard_widget.use_display_resolution() get, and the service caches, the curves at the
+resolution of the screen.
+
+Start the service with
+
+    python -m dashboard.solve_service [--address HOST:PORT] [--authkey KEY] [--archive DIR ...]
+
+and point the kernels at it with dashboard_widget.use_solve_service(), or by setting the
+environment variable LIQCONSTR_SOLVE_SERVICE to HOST:PORT before the dashboard is imported.
+
+The manager unpickles every request it receives, so whoever holds the key can run code as the
+user of the service. Unless a key is given with --authkey or LIQCONSTR_SOLVE_SERVICE_KEY, the
+service generates a random one and writes it to a file only its user can read (key_file), from
+which connect() reads it; the kernels must then run as the same user. The service only listens
+on an address other than the loopback interface with a key given explicitly.
+"""
+
+import argparse
+import ipaddress
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+
+from dashboard.display import decimate
+
+# The address the service listens on
+address_default = ("127.0.0.1", 50538)
+
+# The file of the key generated by a service started without one, readable by its user only
+key_file = os.environ.get(
+    "LIQCONSTR_SOLVE_SERVICE_KEY_FILE",
+    os.path.join(os.path.expanduser("~"), ".liqconstr-solve-service.key"),
+)
+
+# The dashboard functions whose curves the service computes, by name
+curve_functions = ("concavification_curves", "future_kink_curves", "cons_func_curves")
+
+
+def parse_address(address):
+    """
+    Return the (host, port) of an address given as "HOST:PORT", ":PORT" or (host, port).
+    """
+    if address is None:
+        return address_default
+    if isinstance(address, str):
+        host, _, port = address.rpartition(":")
+        return (host or address_default[0], int(port))
+    return tuple(address)
+
+
+def given_authkey(authkey=None):
+    """
+    The key given as an argument or in the environment variable LIQCONSTR_SOLVE_SERVICE_KEY, as
+    bytes, or None if neither is set.
+    """
+    authkey = authkey or os.environ.get("LIQCONSTR_SOLVE_SERVICE_KEY")
+    if not authkey:
+        return None
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+
+def is_loopback(host):
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def write_key(path=None):
+    """
+    Generate a random key, write it to path (by default key_file) readable by this user only and
+    return it.
+    """
+    path = path or key_file
+    authkey = secrets.token_bytes(32)
+    descriptor = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "wb") as f:
+        # The file may have existed with wider permissions
+        os.fchmod(f.fileno(), 0o600)
+        f.write(authkey)
+    return authkey
+
+
+def read_key(path=None):
+    """
+    The key written by a service started without one, from path (by default key_file).
+    """
+    with open(path or key_file, "rb") as f:
+        return f.read()
+
+
+class SolveService:
+    """
+    The curves of the dashboard figures, computed once per (function, slider values, grid)
+    and kept in a cache of at most cache_size entries, the least recently used going first.
+
+    curves() may be called from many threads at once (the manager serves every kernel in a
+    thread of its own); concurrent calls for the same key share one computation. The solves
+    themselves run one at a time, since the solver reuses its work arrays across solves.
+    """
+
+    def __init__(self, cache_size=4096):
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.solving = threading.Lock()
+        self.counts = {"requests": 0, "hits": 0, "coalesced": 0, "solves": 0}
+
+    def curves(self, name, args, x, n_curves, points=None, dtype="float64"):
+        """
+        Return the wealth grid and the (n_curves, len(x)) array of curves of the dashboard
+        function name at the slider values args, evaluated on the wealth grid x; with points,
+        both reduced to the display resolution as arrays of dtype (see dashboard.display).
+        """
+        if name not in curve_functions:
+            raise ValueError("Unknown curve function %s" % name)
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        key = (name, tuple(args), n_curves, x.tobytes(), points, dtype)
+
+        owner = False
+        with self.lock:
+            self.counts["requests"] += 1
+            if key in self.cache:
+                self.counts["hits"] += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            future = self.pending.get(key)
+            if future is not None:
+                self.counts["coalesced"] += 1
+            else:
+                future = self.pending[key] = Future()
+                self.counts["solves"] += 1
+                owner = True
+        if not owner:
+            return future.result()
+
+        try:
+            from dashboard import dashboard_widget
+
+            curve_func = getattr(dashboard_widget, name)
+            with self.solving:
+                curves = curve_func(*args, x=x, out=np.empty((n_curves, len(x))))
+            result = decimate(x, curves, points, np.dtype(dtype))
+        except BaseException as error:
+            with self.lock:
+                del self.pending[key]
+            future.set_exception(error)
+            raise
+
+        with self.lock:
+            self.cache[key] = result
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            del self.pending[key]
+        future.set_result(result)
+        return result
+
+    def stats(self):
+        """
+        The number of requests, of requests answered from the cache, of requests that waited
+        for the same curves requested by another kernel, and of solves, plus the cache size.
+        """
+        with self.lock:
+            return dict(self.counts, cached=len(self.cache))
+
+
+class SolveServiceManager(BaseManager):
+    """
+    The manager that kernels connect to; its service() returns a proxy of the SolveService.
+    """
+
+
+def serve(address=None, authkey=None, cache_size=4096, archives=()):
+    """
+    Run the solve service at address until the process is stopped, reading the curves of the slider positions
+    held by the given archives (see dashboard_widget.use_archive) instead of solving them.
+    """
+    address = parse_address(address)
+    authkey = given_authkey(authkey)
+    if authkey is None:
+        if not is_loopback(address[0]):
+            raise ValueError(
+                "The solve service listens on %s only with a key given by --authkey or "
+                "LIQCONSTR_SOLVE_SERVICE_KEY" % address[0]
+            )
+        authkey = write_key()
+        print("Solve service key written to %s" % key_file)
+
+    # The service solves the curves itself, rather than asking a service as the kernels do
+    os.environ.pop("LIQCONSTR_SOLVE_SERVICE", None)
+    if archives:
+        from dashboard import dashboard_widget
+
+        for path in archives:
+            dashboard_widget.use_archive(path)
+
+    service = SolveService(cache_size)
+    SolveServiceManager.register("service", callable=lambda: service)
+    manager = SolveServiceManager(address=address, authkey=authkey)
+    manager.get_server().serve_forever()
+
+
+def connect(address=None, authkey=None):
+    """
+    Connect to the solve service at address and return a proxy of the SolveService, with the key
+    given as authkey or in LIQCONSTR_SOLVE_SERVICE_KEY, or else the key that the service wrote to
+    key_file.
+    """
+    SolveServiceManager.register("service")
+    authkey = given_authkey(authkey) or read_key()
+    manager = SolveServiceManager(address=parse_address(address), authkey=authkey)
+    manager.connect()
+    return manager.service()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m dashboard.solve_service",
+        description="Serve the curves of the dashboard figures to several kernels.",
+    )
+    parser.add_argument(
+        "--address",
+        default="%s:%d" % address_default,
+        help="HOST:PORT to listen on (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--authkey",
+        help="key that the kernels must present (default: $LIQCONSTR_SOLVE_SERVICE_KEY, or a random "
+        "key written to %s)" % key_file.replace("%", "%%"),
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=4096,
+        help="number of slider configurations kept (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--archive",
+        nargs="+",
+        default=[],
+        metavar="DIR",
+        help="archives of sweeps of the figures to read curves from (python -m liqconstr archive)",
+    )
+    args = parser.parse_args()
+    try:
+        serve(args.address, args.authkey, args.cache_size, args.archive)
+    except ValueError as error:
+        parser.error(str(error))
@@ -0,0 +1,4 @@
+"""
+Tools shared by the notebook that generates the figures for Liquidity Constraints and
+Precautionary Saving (LiqConstr.py) and by the interactive dashboard.
+"""
@@ -0,0 +1,189 @@
+"""
+Command line interface to the figures of the paper, without IPython or the notebook:
+
+    python -m liqconstr figures [--only NAME [NAME ...]] [--formats pdf,png,svg] [--jobs N] [--output DIR]
+
+solves the agents of the selected figures (by default all of them), saves each figure's table and the
+figure itself in the given formats to DIR (by default Figures/), and with --jobs N makes up to N figures
+at the same time in separate processes (the table, format txt, is always saved, and --formats txt saves
+only the tables, without drawing the figures), and
+
+    python -m liqconstr archive NAME --output DIR [--steps N] [--periods T ...] [--dtype float32] [--jobs N]
+
+solves the agents of the dashboard figure NAME at N positions of each of its sliders and writes their
+consumption functions to an archive in DIR (see liqconstr.archive).
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+formats_default = "pdf,png,svg"
+
+# The format of the tables, which are saved by make_figure rather than by matplotlib
+table_format = "txt"
+
+
+def make_figure(name, formats, output, jobs=1):
+    """
+    Solve the agents of one figure, save its table and the figure in each of the formats other than
+    table_format to output, and return the paths of the saved files.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    from liqconstr.export import write_table
+    from liqconstr.figures import scenarios
+    from liqconstr.labels import use_tex
+    from liqconstr.plots import plots
+
+    use_tex()
+    scenario = scenarios[name]
+    paths = [os.path.join(output, name + ".txt")]
+    write_table(paths[0], scenario.functions(jobs=jobs), *scenario.grid)
+
+    formats = [extension for extension in formats if extension != table_format]
+    if formats:
+        f = plots[name](scenario.evaluate(jobs=jobs))
+        for extension in formats:
+            paths.append(os.path.join(output, name + "." + extension))
+            f.savefig(paths[-1])
+        plt.close(f)
+    return paths
+
+
+def figures(args):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    from liqconstr.figures import figures_dir, scenarios
+
+    names = [name for names in args.only or [] for name in names.split(",")]
+    names = names or list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        sys.exit(
+            "Unknown figure %s; the figures are %s"
+            % (", ".join(unknown), ", ".join(scenarios))
+        )
+    formats = [
+        extension for extension in args.formats.split(",") if extension
+    ] or formats_default.split(",")
+    supported = [table_format] + sorted(FigureCanvasAgg.get_supported_filetypes())
+    unknown = [extension for extension in formats if extension not in supported]
+    if unknown:
+        sys.exit(
+            "Unknown format %s; the formats are %s"
+            % (", ".join(unknown), ", ".join(supported))
+        )
+    output = args.output or figures_dir
+    os.makedirs(output, exist_ok=True)
+
+    if args.jobs > 1 and len(names) > 1:
+        # One process per figure; each solves its own agents
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(names))) as executor:
+            futures = [
+                executor.submit(make_figure, name, formats, output) for name in names
+            ]
+            saved = [future.result() for future in futures]
+    else:
+        # A single figure can still solve its agents in parallel
+        saved = [make_figure(name, formats, output, args.jobs) for name in names]
+
+    for paths in saved:
+        for path in paths:
+            print(path)
+
+
+def archive(args):
+    import dashboard.dashboard_widget as dashboard
+
+    if args.name not in dashboard.sweeps:
+        sys.exit(
+            "Unknown dashboard figure %s; the figures are %s"
+            % (args.name, ", ".join(dashboard.sweeps))
+        )
+    written = dashboard.write_sweep(
+        args.name, args.output, args.steps, args.periods, args.dtype, args.jobs
+    )
+    print("%s: %d configurations, %s" % (args.output, len(written), written.shape))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m liqconstr",
+        description="Make the figures of Liquidity Constraints and Precautionary Saving.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    parser_figures = commands.add_parser(
+        "figures", help="solve the agents of the figures and save the figures"
+    )
+    parser_figures.add_argument(
+        "--only",
+        nargs="+",
+        metavar="NAME",
+        help="make only these figures, e.g. ConstrHidesRisk (default: all)",
+    )
+    parser_figures.add_argument(
+        "--formats",
+        default=formats_default,
+        help="comma separated file formats of the figures, txt for the tables only (default: %(default)s)",
+    )
+    parser_figures.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of figures made (or, for one figure, agents solved) at the same time",
+    )
+    parser_figures.add_argument(
+        "--output", help="directory of the figures and tables (default: Figures/)"
+    )
+    parser_figures.set_defaults(run=figures)
+
+    parser_archive = commands.add_parser(
+        "archive",
+        help="solve the agents of a dashboard figure over its slider ranges and archive them",
+    )
+    parser_archive.add_argument(
+        "name", help="the dashboard figure: concavification, future_kink or cons_func"
+    )
+    parser_archive.add_argument(
+        "--output", required=True, help="directory of the archive"
+    )
+    parser_archive.add_argument(
+        "--steps",
+        type=int,
+        default=25,
+        help="positions of each slider (default: %(default)s)",
+    )
+    parser_archive.add_argument(
+        "--periods",
+        type=int,
+        nargs="+",
+        metavar="T",
+        help="periods of the consumption functions (default: all)",
+    )
+    parser_archive.add_argument(
+        "--dtype",
+        default="float64",
+        choices=["float64", "float32"],
+        help="precision of the archived curves (default: %(default)s)",
+    )
+    parser_archive.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of agents solved at the same time",
+    )
+    parser_archive.set_defaults(run=archive)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
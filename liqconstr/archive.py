@@ -0,0 +1,321 @@
+"""
+Archives of the consumption functions of parameter sweeps, read by memory mapping.
+
+A sweep solves the agents of a reactive scenario (see liqconstr.scenario), such as those of a dashboard figure, at
+every combination of the values of its inputs, and evaluates the consumption function of every agent in every
+period on one wealth grid. The result is an array of shape (configurations, agents, periods, points), which over
+the ranges of the dashboard's sliders runs to gigabytes: far more than the tables of Figures/ can hold, or than
+a reader should load to look at a few configurations. An archive is a directory holding
+
+  - index.json: the inputs of the sweep and their values, the labels of the agents, the periods, the solver
+    and a digest of the agents' parameters, the shape and dtype of the curves and their chunks, each with its
+    file, its first configuration and the byte offset at which its data starts;
+  - x.npy: the wealth grid;
+  - configs.npy: the parameter index, the values of the inputs at each configuration, one row per
+    configuration in the order of the curves (the last input varying fastest);
+  - curves-00000.npy, ...: the curves of chunk_configs consecutive configurations each, as a C-ordered array of
+    shape (configurations in the chunk, agents, periods, points).
+
+Archive opens each chunk with np.load(mmap_mode="r") when it is first needed, so looking up one configuration
+only reads that configuration's curves from disk, and a chunk is never read as a whole. Every file is a plain
+.npy array: Matlab maps a chunk with memmapfile(file, 'Offset', offset, 'Format', {'double', fliplr(shape),
+'curves'}) ('single' for archives in float32), with the offset and shape of the chunk in index.json, the
+dimensions reversed because Matlab stores arrays in column-major order.
+
+Archives of the dashboard figures are written by python -m liqconstr archive and read by the dashboard with
+dashboard_widget.use_archive(), which first checks with Archive.check that the archive was written by the same
+solver, for agents with the same parameters and on the same wealth grid as the figure it serves.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from liqconstr import scenario
+
+# Bytes of curves per chunk
+chunk_bytes = 2**26
+
+# The version of the layout written by write_archive
+format_version = 2
+
+index_name = "index.json"
+
+
+def chunk_name(chunk):
+    return "curves-%05d.npy" % chunk
+
+
+def configurations(inputs):
+    """
+    The values of the inputs (a dictionary of arrays, by input name) at every combination of them, the last input
+    varying fastest, as an array of shape (configurations, inputs).
+    """
+    grids = np.meshgrid(
+        *[np.asarray(values, dtype=float) for values in inputs.values()], indexing="ij"
+    )
+    return np.stack([grid.ravel() for grid in grids], axis=1)
+
+
+def parameters_digest(reactive, inputs, configs):
+    """
+    A digest of the solver and of the full parameters of every agent of the ReactiveScenario reactive at the
+    first and the last of the configurations (rows of values of the inputs), which changes when the solver, the
+    base parameters or the variants of the agents do.
+    """
+    keys = [scenario.solver, scenario.parameter_key(reactive.base)]
+    for row in (configs[0], configs[-1]):
+        agents = reactive.scenario(dict(zip(inputs, np.asarray(row).tolist())))
+        keys += [
+            scenario.parameter_key(agents.params(label)) for label in reactive.labels
+        ]
+    return hashlib.sha256(repr(keys).encode()).hexdigest()
+
+
+def write_archive(
+    path,
+    reactive,
+    inputs,
+    x,
+    periods=None,
+    name=None,
+    dtype=np.float64,
+    chunk_configs=None,
+    jobs=1,
+):
+    """
+    Solve the agents of the ReactiveScenario reactive at every combination of the values of its inputs (a
+    dictionary of sequences, by input name), evaluate their consumption functions in the given periods (by
+    default all of them) on the wealth grid x, write them to an archive in the directory path, and return it
+    as an Archive. The name identifies the sweep to its readers, e.g. the dashboard figure it belongs to.
+
+    Each chunk of chunk_configs configurations (by default as many as fit in chunk_bytes) is solved, with jobs
+    worker processes, and written before the next one, so memory does not grow with the size of the sweep.
+    The index is written last: a directory without one is an archive that was not completed.
+    """
+    inputs = OrderedDict(
+        (input, [float(value) for value in values]) for input, values in inputs.items()
+    )
+    configs = configurations(inputs)
+    x = np.asarray(x, dtype=np.float64)
+    if periods is None:
+        periods = range(reactive.base["T_cycle"] + 1)
+    periods = [int(t) for t in periods]
+    labels = reactive.labels
+    dtype = np.dtype(dtype)
+    if chunk_configs is None:
+        config_bytes = len(labels) * len(periods) * len(x) * dtype.itemsize
+        chunk_configs = max(1, chunk_bytes // config_bytes)
+
+    os.makedirs(path, exist_ok=True)
+    index_path = os.path.join(path, index_name)
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    np.save(os.path.join(path, "x.npy"), x)
+    np.save(os.path.join(path, "configs.npy"), configs)
+
+    chunks = []
+    for chunk, first in enumerate(range(0, len(configs), chunk_configs)):
+        rows = configs[first : first + chunk_configs]
+        sweep = [reactive.scenario(dict(zip(inputs, row.tolist()))) for row in rows]
+        cFuncs = scenario.solve_agents(
+            [agents.params(label) for agents in sweep for label in labels], jobs
+        )
+
+        curves = npy_format.open_memmap(
+            os.path.join(path, chunk_name(chunk)),
+            mode="w+",
+            dtype=dtype,
+            shape=(len(rows), len(labels), len(periods), len(x)),
+        )
+        for agent, cFunc in zip(curves.reshape(-1, len(periods), len(x)), cFuncs):
+            for curve, t in zip(agent, periods):
+                curve[:] = cFunc[t](x)
+        curves.flush()
+        chunks.append(
+            OrderedDict(
+                [
+                    ("file", chunk_name(chunk)),
+                    ("first", first),
+                    ("configs", len(rows)),
+                    ("offset", curves.offset),
+                    ("shape", list(curves.shape)),
+                ]
+            )
+        )
+        del curves
+
+    index = OrderedDict(
+        [
+            ("format", format_version),
+            ("name", name),
+            ("inputs", inputs),
+            ("labels", labels),
+            ("periods", periods),
+            ("solver", scenario.solver),
+            ("parameters", parameters_digest(reactive, inputs, configs)),
+            ("points", len(x)),
+            ("shape", [len(configs), len(labels), len(periods), len(x)]),
+            ("dtype", dtype.name),
+            ("chunk_configs", chunk_configs),
+            ("chunks", chunks),
+        ]
+    )
+    with open(index_path, "w") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    return Archive(path)
+
+
+class Archive:
+    """
+    An archive written by write_archive, whose curves are memory-mapped chunk by chunk as they are read.
+
+    inputs holds the values of each input of the sweep, configs the values of the inputs at every configuration
+    and x the wealth grid (both memory-mapped). Indexing an Archive as an array of shape (configurations, agents,
+    periods, points), e.g. archive[config, :, period], reads only the chunks of the selected configurations.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, index_name)) as f:
+            self.index = json.load(f, object_pairs_hook=OrderedDict)
+        if self.index["format"] != format_version:
+            raise ValueError(
+                "Archive %s has format %s; this version reads format %d"
+                % (path, self.index["format"], format_version)
+            )
+        self.name = self.index["name"]
+        self.inputs = OrderedDict(
+            (input, np.array(values)) for input, values in self.index["inputs"].items()
+        )
+        self.labels = self.index["labels"]
+        self.periods = self.index["periods"]
+        self.solver = self.index["solver"]
+        self.shape = tuple(self.index["shape"])
+        self.dtype = np.dtype(self.index["dtype"])
+        self.chunk_configs = self.index["chunk_configs"]
+        self.x = np.load(os.path.join(path, "x.npy"), mmap_mode="r")
+        self.configs = np.load(os.path.join(path, "configs.npy"), mmap_mode="r")
+        self.grid = None
+        self.chunks = {}
+
+    def __len__(self):
+        return self.shape[0]
+
+    def check(self, reactive, x=None):
+        """
+        Raise ValueError unless the archive holds the agents of the ReactiveScenario reactive, solved by the
+        current solver with the parameters they have now, and (if x is given) on the wealth grid x. An archive
+        written before the parameters, the variants or the solver changed would otherwise serve stale curves.
+        """
+        problems = []
+        if self.labels != reactive.labels:
+            problems.append("agents %s, not %s" % (self.labels, reactive.labels))
+        elif self.solver != scenario.solver:
+            problems.append("solver %s, not %s" % (self.solver, scenario.solver))
+        elif self.index["parameters"] != parameters_digest(
+            reactive, self.inputs, self.configs
+        ):
+            problems.append("parameters other than the agents' current ones")
+        if x is not None and not np.array_equal(self.x, x):
+            problems.append("another wealth grid")
+        if problems:
+            raise ValueError(
+                "Archive %s was written with %s" % (self.path, "; ".join(problems))
+            )
+
+    def chunk(self, chunk):
+        """
+        The curves of one chunk, memory-mapped when first needed.
+        """
+        curves = self.chunks.get(chunk)
+        if curves is None:
+            curves = self.chunks[chunk] = np.load(
+                os.path.join(self.path, self.index["chunks"][chunk]["file"]),
+                mmap_mode="r",
+            )
+        return curves
+
+    def curves(self, config):
+        """
+        The curves of one configuration (by its index), a memory-mapped array of shape (agents, periods, points).
+        """
+        chunk, row = divmod(config, self.chunk_configs)
+        return self.chunk(chunk)[row]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        configs, rest = key[0], key[1:]
+        if isinstance(configs, (int, np.integer)):
+            return self.curves(range(len(self))[configs])[rest]
+        selected = np.arange(len(self))[configs]
+        first = self.curves(0)[rest]
+        out = np.empty((len(selected),) + first.shape, dtype=self.dtype)
+        for row, config in zip(out, selected):
+            row[...] = self.curves(config)[rest]
+        return out
+
+    def config(self, values, atol=1e-9):
+        """
+        The index of the configuration at the given values of the inputs (a dictionary by input name, which may
+        hold other entries), or None if the sweep does not include them.
+        """
+        positions = []
+        for input, grid in self.inputs.items():
+            matches = np.flatnonzero(np.isclose(grid, values[input], rtol=0, atol=atol))
+            if not matches.size:
+                return None
+            positions.append(matches[0])
+        return int(
+            np.ravel_multi_index(
+                positions, [len(grid) for grid in self.inputs.values()]
+            )
+        )
+
+    def select(self, atol=1e-9, **values):
+        """
+        The indices of the configurations at which the given inputs take the given values, whatever the values
+        of the other inputs, e.g. archive.select(BoroCnstArt=-6) for every risk with that constraint.
+        """
+        where = np.ones(len(self), dtype=bool)
+        for input, value in values.items():
+            column = list(self.inputs).index(input)
+            where &= np.isclose(self.configs[:, column], value, rtol=0, atol=atol)
+        return np.flatnonzero(where)
+
+    def rows(self, values, labels, period, x=None):
+        """
+        The curves of the given agents in one period at the given values of the inputs, as an array of shape
+        (agents, points) in double precision, or None if the archive does not hold them (or holds them on a
+        wealth grid other than x).
+        """
+        config = self.config(values)
+        if config is None or period not in self.periods:
+            return None
+        if x is not None:
+            if self.grid is None:
+                self.grid = np.asarray(self.x, dtype=np.float64).tobytes()
+            if np.asarray(x, dtype=np.float64).tobytes() != self.grid:
+                return None
+        rows = [self.labels.index(label) for label in labels]
+        return np.array(
+            self.curves(config)[rows, self.periods.index(period)], dtype=np.float64
+        )
+
+    def table(self, values, period):
+        """
+        The curves of every agent in one period at the given values of the inputs as a table like those of
+        Figures/ (see liqconstr.export.read_table): the wealth grid in the first column, one agent per column.
+        """
+        rows = self.rows(values, self.labels, period)
+        if rows is None:
+            raise KeyError(
+                "Archive %s does not hold period %s at %s" % (self.path, period, values)
+            )
+        return np.column_stack([self.x, rows.T])
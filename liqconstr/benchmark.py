@@ -0,0 +1,363 @@
+"""
+Timings of the figure pipeline and the dashboard callbacks, with a fingerprint of the environment they ran in.
+
+The timings of the figures depend on the machine, the versions of HARK and numpy and the number of threads the
+numerical libraries start, so they are only comparable together with a description of all of these. The cases
+here time
+
+  - for each figure, solving its agents from cold caches, solving and evaluating them on the figure's grid, and
+    making the figure from scratch as python -m liqconstr figures does (typeset labels, saved as png);
+  - for each dashboard figure, dragging its slider across its range: one callback per slider position, starting
+    from cold caches, as in LiqConstr-Dashboard.ipynb;
+
+and write the times, the settings of the run and the environment fingerprint as JSON. With --count, each case
+is run once more while counting the operations of its solves (see liqconstr.counters), and the counts of every
+solved agent, by period, are written with its times. Run as
+
+    python -m liqconstr.benchmark [--cases PREFIX ...] [--repeat N] [--count] [--output FILE]
+
+or in the container of reproduce/Dockerfile with reproduce/benchmark.sh. The threads of OpenMP, MKL, OpenBLAS
+and Accelerate are pinned to threads_default unless the environment sets them, before numpy is first imported.
+"""
+
+import os
+
+# The number of threads of the numerical libraries, unless set in the environment
+threads_default = "1"
+thread_variables = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+for variable in thread_variables:
+    os.environ.setdefault(variable, threads_default)
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from liqconstr import counters, egm, scenario
+from liqconstr.figures import scenarios
+
+# The number of slider positions of each dashboard case
+slider_steps = 25
+
+Case = namedtuple("Case", ["name", "run", "setup"])
+Case.__doc__ = """
+One benchmark case: its name, the function that is timed and the function called before each timing, e.g. to
+clear the caches (or None).
+"""
+
+
+def clear_caches():
+    """
+    Forget every solved agent, every income distribution, asset grid and work array built for a solve and
+    the curves of the previous render of each dashboard figure, so that the next solve starts cold.
+    """
+    scenario.solved_cFuncs.clear()
+    egm.income_dstns.clear()
+    egm.asset_grids.clear()
+    egm.workspaces.clear()
+    dashboard = sys.modules.get("dashboard.dashboard_widget")
+    if dashboard is not None:
+        dashboard.cons_func_ranges.cache_clear()
+        for figure in (dashboard.CCC, dashboard.Bcons, dashboard.WwCR):
+            figure.clear()
+
+
+def figure_cases():
+    """
+    The cases of the figures of the paper, three for each figure: solve, evaluate and make.
+    """
+    from liqconstr.__main__ import make_figure
+
+    output = tempfile.mkdtemp(prefix="liqconstr-benchmark-")
+    cases = []
+    for name, figure in scenarios.items():
+        cases += [
+            Case("figure/%s/solve" % name, figure.solve, clear_caches),
+            Case("figure/%s/evaluate" % name, figure.evaluate, clear_caches),
+            Case(
+                "figure/%s/make" % name,
+                lambda name=name: make_figure(name, ["png"], output),
+                clear_caches,
+            ),
+        ]
+    return cases
+
+
+def dashboard_cases():
+    """
+    The cases of the dashboard figures: for each slider of each figure, named by its parameter, the callbacks
+    of a drag across the slider's range with the other sliders of the figure at their defaults.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    import dashboard.dashboard_widget as dashboard
+
+    def drag(callback, positions):
+        def run():
+            for args in positions:
+                callback(*args)
+                plt.close("all")
+
+        return run
+
+    sliders = [
+        (
+            "concavification",
+            dashboard.make_concavification_figure,
+            [
+                ("BoroCnstArt", dashboard.BoroCnstArt_widget[0]),
+                ("UnempPrb", dashboard.UnempProb_widget),
+            ],
+        ),
+        (
+            "future_kink",
+            dashboard.make_future_kink,
+            [("BoroCnstArt", dashboard.BoroCnstArt_widget[1])],
+        ),
+        (
+            "cons_func",
+            dashboard.make_cons_func,
+            [
+                ("BoroCnstArt", dashboard.BoroCnstArt_widget[2]),
+                ("TranShkStd", dashboard.TranShkStd_widget),
+            ],
+        ),
+    ]
+
+    cases = []
+    for name, callback, widgets in sliders:
+        defaults = [widget.value for _, widget in widgets]
+        for i, (parameter, widget) in enumerate(widgets):
+            positions = [
+                defaults[:i] + [value] + defaults[i + 1 :]
+                for value in dashboard.slider_values(widget, slider_steps)
+            ]
+            cases.append(
+                Case(
+                    "dashboard/%s/%s" % (name, parameter),
+                    drag(callback, positions),
+                    clear_caches,
+                )
+            )
+    return cases
+
+
+def time_case(case, repeat):
+    """
+    Time repeat runs of the case and return the times in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        if case.setup is not None:
+            case.setup()
+        start = time.perf_counter()
+        case.run()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def count_case(case):
+    """
+    Run the case once while counting the operations of its solves, and return the counts as a dictionary
+    ready for JSON: their totals over the case and the counts of every solved agent.
+    """
+    if case.setup is not None:
+        case.setup()
+    with counters.counting() as agents:
+        case.run()
+    return OrderedDict(
+        [
+            ("totals", counters.summary(agents)),
+            ("agents", [counts.as_dict() for counts in agents]),
+        ]
+    )
+
+
+def version(module):
+    try:
+        return __import__(module).__version__
+    except Exception:
+        return None
+
+
+def git_commit():
+    """
+    The commit of the repository that is benchmarked, with "-dirty" if it has uncommitted changes, or None
+    outside a git checkout.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=root, stderr=subprocess.DEVNULL
+        )
+        status = subprocess.check_output(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit.decode().strip() + ("-dirty" if status.strip() else "")
+
+
+def thread_pools():
+    """
+    The thread pools of the numerical libraries loaded by numpy, if threadpoolctl is installed.
+    """
+    try:
+        from threadpoolctl import threadpool_info
+    except ImportError:
+        return None
+    return [
+        {key: info.get(key) for key in ("internal_api", "version", "num_threads")}
+        for info in threadpool_info()
+    ]
+
+
+def fingerprint():
+    """
+    A description of the machine and the software that the timings depend on.
+    """
+    from liqconstr.parameters import init_lifecycle
+
+    return OrderedDict(
+        [
+            ("time", datetime.datetime.now(datetime.timezone.utc).isoformat()),
+            ("commit", git_commit()),
+            ("python", platform.python_version()),
+            ("implementation", platform.python_implementation()),
+            ("platform", platform.platform()),
+            ("machine", platform.machine()),
+            ("processor", platform.processor()),
+            ("cpu_count", os.cpu_count()),
+            ("container", os.path.exists("/.dockerenv")),
+            (
+                "versions",
+                OrderedDict(
+                    (module, version(module))
+                    for module in (
+                        "HARK",
+                        "numpy",
+                        "scipy",
+                        "matplotlib",
+                        "ipywidgets",
+                    )
+                ),
+            ),
+            (
+                "threads",
+                OrderedDict(
+                    (variable, os.environ.get(variable))
+                    for variable in thread_variables
+                ),
+            ),
+            ("thread_pools", thread_pools()),
+            ("solver", scenario.solver),
+            (
+                "calibration",
+                OrderedDict(
+                    (key, init_lifecycle[key])
+                    for key in ("aXtraCount", "TranShkCount", "PermShkCount")
+                    if key in init_lifecycle
+                ),
+            ),
+        ]
+    )
+
+
+def run(cases=None, repeat=3, count=False):
+    """
+    Time the cases whose names start with one of the given prefixes (by default all of them) and return the
+    results as a dictionary ready for JSON: the fingerprint, the settings and the times of each case, with the
+    operation counts of each case if count is true.
+    """
+    selected = []
+    for case in figure_cases() + dashboard_cases():
+        if cases is None or any(case.name.startswith(prefix) for prefix in cases):
+            selected.append(case)
+
+    results = []
+    for case in selected:
+        times = time_case(case, repeat)
+        result = OrderedDict(
+            [
+                ("name", case.name),
+                ("min", min(times)),
+                ("median", float(np.median(times))),
+                ("times", times),
+            ]
+        )
+        if count:
+            result["counts"] = count_case(case)
+        results.append(result)
+    return OrderedDict(
+        [
+            ("fingerprint", fingerprint()),
+            (
+                "settings",
+                OrderedDict(
+                    [
+                        ("repeat", repeat),
+                        ("slider_steps", slider_steps),
+                        ("count", count),
+                    ]
+                ),
+            ),
+            ("cases", results),
+        ]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m liqconstr.benchmark",
+        description="Time the figures and the dashboard and write the times as JSON.",
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        metavar="PREFIX",
+        help="time only the cases whose names start with these, e.g. figure/ or dashboard/cons_func",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="timings of each case (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="also count the operations of the solves of each case, by agent and period",
+    )
+    parser.add_argument("--output", help="file of the JSON results (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = run(args.cases, args.repeat, args.count)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Accuracy against cost of the grid and shock discretization used to solve the figures' consumers.
+
+The figures are solved with the end-of-period asset grid (aXtraCount points) and the number of transitory
+shock nodes (TranShkCount) of the calibration in liqconstr.parameters. This module re-solves each figure's
+agents under a ladder of such settings and compares them with a reference solution with the same shock nodes
+on a fine asset grid:
+
+  - at the omega points, the kinks of the reference consumption functions where a constraint starts or
+    stops binding, by the error in the level of consumption and by the distance to the nearest kink of
+    the approximate solution;
+  - on the precautionary gaps between a consumer with and without the risk, whose comparison across the
+    constrained and unconstrained consumers is the subject of Theorem 2;
+  - on the whole grid of the figure.
+
+The number of shock nodes is not compared with a reference of many more nodes: the lowest node sets the
+natural borrowing constraint, so each number of nodes describes a consumer of its own whose solution does not
+converge to that of the finer discretization near the constraint, where the figures are drawn.
+
+The cost of the settings is the work of the solution, the number of (asset grid point, shock node) pairs at
+which the expectation of next period's marginal value is taken, summed over the periods of every distinct
+agent. Unlike the solve time, which is reported alongside, it does not change from run to run, so it gives
+the same Pareto frontier of accuracy against cost, and the same cheapest settings that meet a tolerance,
+every time. Run as
+
+    python -m liqconstr.convergence
+
+to print the table for all figures.
+"""
+
+import itertools
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from liqconstr import derivatives, egm
+from liqconstr.figures import scenarios
+from liqconstr.scenario import parameter_key, solve_agent
+
+# The settings that the reference solution adds to those of the ladder
+reference_settings = {"aXtraCount": 800}
+
+# Kinks of the reference solution whose change in slope exceeds this are taken as omega points. The kinks
+# of a binding constraint change the slope by 0.1 or more, while the curvature of the consumption functions
+# of the risky consumers shows up as changes of about 0.01 between the points of a fine grid.
+omega_tol = 0.05
+
+# Pairs of (without risk, with risk) consumers whose gap in consumption is the precautionary saving due to
+# the risk, by figure
+precautionary_gaps = {
+    "ConsWithWithoutConstrAndRisk": [("unconstr", "risk"), ("constr", "constr_risk")],
+    "ConstrHidesRisk": [("unconstr", "risk"), ("constr", "constr_risk")],
+}
+
+Trial = namedtuple(
+    "Trial",
+    [
+        "figure",
+        "settings",
+        "work",
+        "time",
+        "omega_error",
+        "kink_shift",
+        "gap_error",
+        "grid_error",
+    ],
+)
+Trial.__doc__ = """
+The accuracy and cost of one figure's consumers solved with one set of settings: the work of the solution
+(see work), the seconds it took, the largest error in consumption at the omega points, the largest distance from an omega point
+to a kink of the approximate solution, the largest error in the precautionary gaps and the largest error in
+consumption on the figure's grid.
+"""
+
+
+def ladder(aXtraCounts=(12, 24, 48, 96, 192, 384), TranShkCounts=(3, 5, 7, 15, 31)):
+    """
+    The settings to try: every combination of the given asset grid sizes and numbers of shock nodes.
+    Cubic interpolation (CubicBool) is not among them, as the array solver of liqconstr.egm only
+    interpolates linearly and would hand cubic consumers to HARK, whose cost is not that of the same steps.
+    """
+    return [
+        {"aXtraCount": aXtraCount, "TranShkCount": TranShkCount}
+        for aXtraCount, TranShkCount in itertools.product(aXtraCounts, TranShkCounts)
+    ]
+
+
+def distinct_agents(scenario, settings):
+    """
+    The parameters of every distinct agent of the scenario with the settings added, by parameter key.
+    """
+    agents = OrderedDict()
+    for label in scenario.labels:
+        params = dict(scenario.params(label), **settings)
+        agents.setdefault(parameter_key(params), params)
+    return agents
+
+
+def work(scenario, settings):
+    """
+    The number of (asset grid point, shock node) pairs at which the distinct agents of the scenario with the
+    settings added take the expectation of next period's marginal value, over all their periods: the inner
+    loop of the endogenous grid method, whose size sets the cost of a solution. Shock nodes that coincide,
+    such as the transitory shock nodes of a consumer without transitory risk, count once.
+    """
+    total = 0
+    for params in distinct_agents(scenario, settings).values():
+        p = egm.Parameters(params)
+        points = egm.asset_grid(p).size
+        for t in range(p.T_cycle):
+            PermShkVals, _, _ = egm.income_dstn(
+                p.PermShkStd[t],
+                p.PermShkCount,
+                p.TranShkStd[t],
+                p.TranShkCount,
+                p.UnempPrb,
+                p.IncUnemp,
+            )
+            total += points * PermShkVals.size
+    return total
+
+
+def solve_figure(scenario, settings, repeat=1):
+    """
+    Solve every distinct agent of the scenario with the settings added to its parameters, bypassing the
+    cache of solved agents. Returns the period consumption function of each label and the solve time in
+    seconds (the fastest of repeat solves).
+    """
+    agents = distinct_agents(scenario, settings)
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cFuncs = {key: solve_agent(params) for key, params in agents.items()}
+        best = min(best, time.perf_counter() - start)
+
+    functions = OrderedDict()
+    for label in scenario.labels:
+        key = parameter_key(dict(scenario.params(label), **settings))
+        functions[label] = cFuncs[key][scenario.period]
+    return functions, best
+
+
+def omega_points(cFunc, start, stop, tol=None):
+    """
+    The kinks of cFunc between start and stop whose change in slope exceeds tol (by default omega_tol).
+    """
+    if tol is None:
+        tol = omega_tol
+    points, jumps = derivatives.kinks(cFunc)
+    return points[(points > start) & (points < stop) & (np.abs(jumps) > tol)]
+
+
+def finite_max(values):
+    """
+    The largest of the values that are not NaN, or 0 if there are none.
+    """
+    return values[~np.isnan(values)].max(initial=0)
+
+
+def compare(figure, reference, functions, settings, seconds):
+    """
+    Measure the consumption functions of one figure's agents solved with the settings against the
+    reference functions, both dictionaries by label, and return the Trial.
+    """
+    start, stop, num = scenarios[figure].grid
+    x = np.linspace(start, stop, num)
+
+    omega_error, kink_shift, grid_error = 0.0, 0.0, 0.0
+    for label, cFunc in functions.items():
+        omega = omega_points(reference[label], start, stop)
+        if omega.size:
+            omega_error = max(
+                omega_error, np.max(np.abs(cFunc(omega) - reference[label](omega)))
+            )
+            kinks = omega_points(cFunc, start, stop, omega_tol / 2)
+            if kinks.size:
+                shift = np.abs(omega[:, np.newaxis] - kinks[np.newaxis, :]).min(axis=1)
+                kink_shift = max(kink_shift, shift.max())
+            else:
+                kink_shift = np.inf
+        grid_error = max(grid_error, finite_max(np.abs(cFunc(x) - reference[label](x))))
+
+    gap_error = 0.0
+    for safe, risky in precautionary_gaps.get(figure, []):
+        gap = functions[safe](x) - functions[risky](x)
+        gap_ref = reference[safe](x) - reference[risky](x)
+        gap_error = max(gap_error, finite_max(np.abs(gap - gap_ref)))
+
+    return Trial(
+        figure,
+        settings,
+        work(scenarios[figure], settings),
+        seconds,
+        omega_error,
+        kink_shift,
+        gap_error,
+        grid_error,
+    )
+
+
+def run(figures=None, settings=None, reference=None, repeat=3):
+    """
+    Solve the agents of the given figures (by default all of them) with each of the settings (by default
+    the ladder) and with the same settings updated by the reference settings, and return the list of
+    Trials.
+    """
+    if figures is None:
+        figures = list(scenarios)
+    if settings is None:
+        settings = ladder()
+    if reference is None:
+        reference = reference_settings
+
+    trials = []
+    for figure in figures:
+        references = {}
+        for setting in settings:
+            reference_setting = dict(setting, **reference)
+            key = parameter_key(reference_setting)
+            if key not in references:
+                references[key], _ = solve_figure(scenarios[figure], reference_setting)
+            functions, seconds = solve_figure(scenarios[figure], setting, repeat)
+            trials.append(compare(figure, references[key], functions, setting, seconds))
+    return trials
+
+
+def error(trial):
+    """
+    The error that the settings are judged by: the largest of the errors at the omega points, the distance
+    by which the kinks moved away from them and the errors in the precautionary gaps. Consumption and market
+    resources are both normalized by permanent income, so the three are in the same units. Settings that
+    lose a kink altogether (kink_shift = inf) have an infinite error.
+    """
+    return max(trial.omega_error, trial.kink_shift, trial.gap_error)
+
+
+def pareto(trials, rtol=1e-9):
+    """
+    The trials that are not dominated by another trial of the same figure, i.e. for which no other
+    settings are both at most as much work and at least as accurate (and strictly one of the two). Errors
+    within a relative rtol of each other count as equal. Settings with an infinite error, e.g. a grid too
+    coarse to show a kink, are never on the frontier however cheap.
+    """
+
+    def dominates(other, trial):
+        as_accurate = error(other) <= error(trial) * (1 + rtol)
+        more_accurate = error(other) < error(trial) * (1 - rtol)
+        return (
+            other.figure == trial.figure
+            and other.work <= trial.work
+            and as_accurate
+            and (other.work < trial.work or more_accurate)
+        )
+
+    return [
+        trial
+        for trial in trials
+        if np.isfinite(error(trial))
+        and not any(dominates(other, trial) for other in trials)
+    ]
+
+
+def fastest(trials, tol):
+    """
+    For each figure, the settings with the least work whose error is within tol, or None if no settings
+    are.
+    """
+    best = OrderedDict()
+    for trial in trials:
+        best.setdefault(trial.figure, None)
+        if error(trial) <= tol and (
+            best[trial.figure] is None or trial.work < best[trial.figure].work
+        ):
+            best[trial.figure] = trial
+    return best
+
+
+def table(trials):
+    """
+    Format the trials as a text table, sorted by figure and work, with the settings on the Pareto
+    frontier marked by an asterisk.
+    """
+    frontier = set(map(id, pareto(trials)))
+    names = sorted({name for trial in trials for name in trial.settings})
+    header = (
+        ["figure"]
+        + names
+        + [
+            "work",
+            "time",
+            "omega_error",
+            "kink_shift",
+            "gap_error",
+            "grid_error",
+            "pareto",
+        ]
+    )
+    rows = [header]
+    for trial in sorted(trials, key=lambda trial: (trial.figure, trial.work)):
+        rows.append(
+            [trial.figure]
+            + [str(trial.settings.get(name, "")) for name in names]
+            + [str(trial.work), "%.4f" % trial.time]
+            + [
+                "%.2e" % value
+                for value in (
+                    trial.omega_error,
+                    trial.kink_shift,
+                    trial.gap_error,
+                    trial.grid_error,
+                )
+            ]
+            + ["*" if id(trial) in frontier else ""]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+if __name__ == "__main__":
+    print(table(run()))
@@ -0,0 +1,208 @@
+"""
+Counts of the operations that the solves of the figures' consumers perform, by agent and period.
+
+Wall-clock times say how long the consumers take to solve but not why the consumers with income risk take so
+much longer than the perfect foresight ones. Within counting(), every agent solved by liqconstr.scenario is
+recorded with the time of its solve and, for every period of its backward induction, the number of
+
+  - interpolants: HARK interpolants constructed (LinearInterp, CubicInterp and LowerEnvelope);
+  - interpolant_points: points at which a piecewise linear or cubic function is evaluated, e.g. next period's
+    consumption function at every shock node and grid point;
+  - utility_inverse: evaluations of the inverse of marginal utility, one per point of the endogenous grid;
+  - expectation_nodes: (shock node, grid point) pairs summed over in the end-of-period expectation.
+
+Every count is of work the solver actually does; none is estimated. For HARK's solvers, interpolants and
+interpolant_points are counted by instrumenting HARK's interpolants. The array-based solver in liqconstr.egm
+counts its own array operations: it constructs HARK interpolants only for the consumption functions it
+returns, and it evaluates next period's consumption function on its own arrays, counting two piecewise linear
+functions (the unconstrained one and the constraint) per point, as its LowerEnvelope would evaluate them.
+The counts of the two solvers measure the work each of them does, not the same work done two ways.
+Operations outside the periods of the backward induction, such as the terminal solution, are counted in the
+terminal period T_cycle. Solves in worker processes (jobs > 1) are not counted.
+"""
+
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+from HARK.interpolation import CubicInterp, LinearInterp, LowerEnvelope
+
+operations = (
+    "interpolants",
+    "interpolant_points",
+    "utility_inverse",
+    "expectation_nodes",
+)
+
+# The AgentCounts recorded within counting(), or None when not counting
+record = None
+
+# The AgentCounts of the agent being solved, or None
+current = None
+
+
+class AgentCounts:
+    """
+    The operation counts of one solved agent, by period, with the solver that solved it, its parameters that
+    differ from the lifecycle calibration, and the time of its solve in seconds.
+    """
+
+    def __init__(self, params, solver):
+        from liqconstr.egm import Parameters
+        from liqconstr.parameters import init_lifecycle
+        from liqconstr.scenario import parameter_key
+
+        self.solver = solver
+        self.params = OrderedDict(
+            (key, value)
+            for key, value in sorted(params.items())
+            if key not in init_lifecycle
+            or parameter_key(value) != parameter_key(init_lifecycle[key])
+        )
+        self.T_cycle = Parameters(params).T_cycle
+        self.period = self.T_cycle
+        self.periods = OrderedDict()
+        self.time = None
+
+    def add(self, operation, n=1):
+        counts = self.periods.get(self.period)
+        if counts is None:
+            counts = self.periods[self.period] = Counter()
+        counts[operation] += n
+
+    def totals(self):
+        totals = Counter()
+        for counts in self.periods.values():
+            totals.update(counts)
+        return OrderedDict((operation, totals[operation]) for operation in operations)
+
+    def as_dict(self):
+        """
+        The counts as a dictionary ready for JSON.
+        """
+        return OrderedDict(
+            [
+                ("solver", self.solver),
+                ("params", self.params),
+                ("time", self.time),
+                ("totals", self.totals()),
+                (
+                    "periods",
+                    OrderedDict(
+                        (
+                            str(period),
+                            OrderedDict(
+                                (operation, counts[operation])
+                                for operation in operations
+                            ),
+                        )
+                        for period, counts in sorted(self.periods.items())
+                    ),
+                ),
+            ]
+        )
+
+
+def add(operation, n=1):
+    """
+    Count n operations of the agent being solved in its current period, if counting.
+    """
+    if current is not None:
+        current.add(operation, n)
+
+
+def period(t):
+    """
+    Count the following operations of the agent being solved in period t.
+    """
+    if current is not None:
+        current.period = t
+
+
+def next_period():
+    """
+    Count the following operations of the agent being solved in the period before the current one, as the
+    backward induction moves on.
+    """
+    if current is not None:
+        current.period -= 1
+
+
+@contextmanager
+def agent(params, solver):
+    """
+    Count the operations of solving the agent with the given parameters, with the named solver, if counting.
+    """
+    global current
+
+    if record is None:
+        yield None
+        return
+
+    counts = AgentCounts(params, solver)
+    current = counts
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        counts.time = time.perf_counter() - start
+        current = None
+        record.append(counts)
+
+
+def count_constructions(cls):
+    init = cls.__init__
+
+    def __init__(self, *args, **kwds):
+        add("interpolants")
+        init(self, *args, **kwds)
+
+    return "__init__", init, __init__
+
+
+def count_points(cls):
+    evaluate = cls._evaluate
+
+    def _evaluate(self, x, *args, **kwds):
+        add("interpolant_points", np.size(x))
+        return evaluate(self, x, *args, **kwds)
+
+    return "_evaluate", evaluate, _evaluate
+
+
+@contextmanager
+def counting():
+    """
+    Count the operations of every agent solved within the context, which yields the list of their AgentCounts.
+    HARK's interpolants are instrumented for the duration of the context.
+    """
+    global record
+
+    patches = [
+        (cls,) + count_constructions(cls)
+        for cls in (LinearInterp, CubicInterp, LowerEnvelope)
+    ]
+    patches += [(cls,) + count_points(cls) for cls in (LinearInterp, CubicInterp)]
+    for cls, name, original, patched in patches:
+        setattr(cls, name, patched)
+    record = []
+    try:
+        yield record
+    finally:
+        record = None
+        for cls, name, original, patched in reversed(patches):
+            setattr(cls, name, original)
+
+
+def summary(agents):
+    """
+    The totals of the given AgentCounts, by operation, with their number and total solve time.
+    """
+    totals = Counter()
+    for counts in agents:
+        totals.update(counts.totals())
+    summary = OrderedDict([("agents", len(agents))])
+    summary["time"] = sum(counts.time for counts in agents)
+    summary.update((operation, totals[operation]) for operation in operations)
+    return summary
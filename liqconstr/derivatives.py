@@ -0,0 +1,118 @@
+"""
+Marginal propensities to consume, curvature and prudence of solved consumption functions.
+
+The consumption functions in this project are piecewise linear: each is a LinearInterp, or the LowerEnvelope
+of an unconstrained LinearInterp and the line c = m - m_min of a binding constraint. Their slopes are known
+exactly from the interpolation nodes, and all of their curvature sits at the kinks between linear pieces.
+The functions here read these quantities off the interpolants instead of finite-differencing arrays of
+consumption levels.
+
+Every function accepts either a single consumption function or a sequence of them (e.g. agent.cFunc for
+all periods, or one period's function for several agents), and then returns one row per function.
+"""
+
+import numpy as np
+from HARK.interpolation import LowerEnvelope
+
+
+def _batch(function, cFunc, x, *args):
+    if callable(cFunc):
+        return function(cFunc, x, *args)
+    rows = np.empty((len(cFunc), np.size(x)))
+    for row, func, *row_args in zip(rows, cFunc, *args):
+        row[:] = function(func, x, *row_args)
+    return rows
+
+
+def _mpc(cFunc, x):
+    return cFunc.derivative(np.asarray(x, dtype=float))
+
+
+def _curvature(cFunc, x):
+    # The second derivative of a piecewise linear function is zero except for point masses at its kinks.
+    # On a grid, c''(x_i) is the change in the exact slope across the cell around x_i (bounded by the
+    # midpoints to the neighbouring grid points) divided by the width of the cell.
+    x = np.asarray(x, dtype=float)
+    edges = np.empty(x.size + 1)
+    edges[1:-1] = (x[1:] + x[:-1]) / 2
+    edges[0] = x[0] - (x[1] - x[0]) / 2
+    edges[-1] = x[-1] + (x[-1] - x[-2]) / 2
+    slopes = cFunc.derivative(edges)
+    return np.diff(slopes) / np.diff(edges)
+
+
+def _prudence(cFunc, x, CRRA):
+    # With v'(m) = u'(c(m)) and CRRA utility, -v'''/v'' = (CRRA + 1) c'/c - c''/c'
+    c, mpc = cFunc.eval_with_derivative(np.asarray(x, dtype=float))
+    return (CRRA + 1) * mpc / c - _curvature(cFunc, x) / mpc
+
+
+def mpc(cFunc, x):
+    """
+    The marginal propensity to consume c'(x) at each point of the grid x.
+    """
+    return _batch(_mpc, cFunc, x)
+
+
+def curvature(cFunc, x):
+    """
+    The second derivative c''(x) on the sorted grid x (with at least two points), averaged over the cell
+    around each grid point so that the kinks of the consumption function are not missed between points.
+    """
+    return _batch(_curvature, cFunc, x)
+
+
+def prudence(cFunc, x, CRRA):
+    """
+    The prudence of the value function, -v'''(x)/v''(x), at each point of the sorted grid x, for a
+    consumer with coefficient of relative risk aversion CRRA (one per function when cFunc is a sequence).
+    """
+    if callable(cFunc):
+        return _prudence(cFunc, x, CRRA)
+    return _batch(_prudence, cFunc, x, np.broadcast_to(CRRA, len(cFunc)))
+
+
+def breakpoints(cFunc):
+    """
+    The sorted points at which a piecewise linear consumption function can change slope: the nodes of its
+    linear interpolants, plus the points where a lower envelope switches from one function to another.
+    """
+    if isinstance(cFunc, LowerEnvelope):
+        points = np.unique(np.concatenate([breakpoints(f) for f in cFunc.functions]))
+        values = [f(points) for f in cFunc.functions]
+        crossings = [points]
+        for i in range(len(values)):
+            for j in range(i + 1, len(values)):
+                # Between consecutive points both functions are linear, so where their difference changes
+                # sign the crossing can be found exactly
+                diff = values[i] - values[j]
+                switch = np.flatnonzero(diff[:-1] * diff[1:] < 0)
+                crossings.append(
+                    points[switch]
+                    - diff[switch]
+                    * (points[switch + 1] - points[switch])
+                    / (diff[switch + 1] - diff[switch])
+                )
+        return np.unique(np.concatenate(crossings))
+    if hasattr(cFunc, "x_list"):
+        return np.asarray(cFunc.x_list, dtype=float)
+    raise TypeError(
+        "Cannot find the kinks of a %s; expected a LinearInterp or a LowerEnvelope"
+        % type(cFunc).__name__
+    )
+
+
+def kinks(cFunc, tol=1e-10):
+    """
+    The kinks of a piecewise linear consumption function, i.e. the points where its slope changes by more
+    than tol, and the change in slope at each of them (negative where the function becomes flatter, as at
+    the kinks induced by liquidity constraints).
+    """
+    points = breakpoints(cFunc)
+    levels = cFunc(points)
+    finite = np.isfinite(levels)
+    points, levels = points[finite], levels[finite]
+    slopes = np.diff(levels) / np.diff(points)
+    jumps = np.diff(slopes)
+    big = np.abs(jumps) > tol
+    return points[1:-1][big], jumps[big]
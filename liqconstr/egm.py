@@ -0,0 +1,267 @@
+"""
+An array-based endogenous grid solver for the lifecycle consumers of the figures and the dashboard.
+
+The consumers are all of one class: CRRA utility, a finite lifecycle solved once (cycles = 1), lognormal
+transitory (and permanent) income shocks with an optional point mass of unemployment, linear interpolation
+of the consumption function, and artificial borrowing constraints BoroCnstArt that may differ by period.
+HARK solves such a consumer by constructing a solver object, an income distribution object and several
+interpolants for every period. The solver here performs the same endogenous grid steps on preallocated
+arrays that are reused by every solve with the same shape, keeping each period's consumption function as
+the arrays of its interpolation nodes, and only builds HARK interpolants for the consumption functions it
+returns. The discretized income shocks and asset grids are constructed once per calibration.
+
+The consumption functions are those of HARK's ConsIndShockSolverBasic up to rounding: shock nodes with the
+same permanent and transitory shocks (e.g. the PermShkCount identical nodes of a consumer without
+permanent shocks) are merged into one node with their total probability.
+"""
+
+import numpy as np
+from HARK.ConsumptionSaving.ConsIndShockModel import (
+    constructAssetsGrid,
+    init_idiosyncratic_shocks,
+)
+from HARK.distribution import (
+    MeanOneLogNormal,
+    addDiscreteOutcomeConstantMean,
+    combineIndepDstns,
+)
+from HARK.interpolation import LinearInterp, LowerEnvelope
+
+from liqconstr import counters
+
+# Discretized income shocks, keyed by the parameters of one period's income process
+income_dstns = {}
+
+# End-of-period asset grids, keyed by the parameters of the grid
+asset_grids = {}
+
+# Work arrays, keyed by (shock nodes, grid points, periods)
+workspaces = {}
+
+
+class Parameters:
+    """
+    The parameters of a consumer, as attributes, with HARK's defaults for those that are not given.
+    """
+
+    def __init__(self, params):
+        self.__dict__.update(init_idiosyncratic_shocks)
+        self.__dict__.update(params)
+
+
+def supports(params):
+    """
+    Whether the consumer with the given parameters belongs to the class of consumers solved here.
+    """
+    p = Parameters(params)
+    return (
+        p.__dict__.get("cycles", 1) == 1
+        and not p.CubicBool
+        and not p.vFuncBool
+        and (p.T_retire <= 0 or p.T_retire >= p.T_cycle)
+    )
+
+
+def income_dstn(PermShkStd, PermShkCount, TranShkStd, TranShkCount, UnempPrb, IncUnemp):
+    """
+    Return the (permanent shocks, transitory shocks, probabilities) of one period's income process,
+    discretized as by HARK, with identical nodes merged.
+    """
+    key = (PermShkStd, PermShkCount, TranShkStd, TranShkCount, UnempPrb, IncUnemp)
+    dstn = income_dstns.get(key)
+    if dstn is None:
+        TranShkDstn = MeanOneLogNormal(sigma=TranShkStd).approx(TranShkCount, tail_N=0)
+        if UnempPrb > 0:
+            TranShkDstn = addDiscreteOutcomeConstantMean(
+                TranShkDstn, p=UnempPrb, x=IncUnemp
+            )
+        PermShkDstn = MeanOneLogNormal(sigma=PermShkStd).approx(PermShkCount, tail_N=0)
+        IncomeDstn = combineIndepDstns(PermShkDstn, TranShkDstn)
+
+        nodes, inverse = np.unique(
+            np.stack(IncomeDstn.X, axis=1), axis=0, return_inverse=True
+        )
+        ShkPrbs = np.bincount(inverse.ravel(), weights=IncomeDstn.pmf)
+        dstn = (nodes[:, 0].copy(), nodes[:, 1].copy(), ShkPrbs)
+        income_dstns[key] = dstn
+    return dstn
+
+
+def asset_grid(p):
+    """
+    Return the grid of end-of-period assets above the natural borrowing constraint, as HARK makes it.
+    """
+    key = (p.aXtraMin, p.aXtraMax, p.aXtraCount, p.aXtraNestFac, tuple(p.aXtraExtra))
+    grid = asset_grids.get(key)
+    if grid is None:
+        grid = constructAssetsGrid(p)
+        asset_grids[key] = grid
+    return grid
+
+
+class Workspace:
+    """
+    The arrays used by the solver for consumers with a given number of shock nodes, grid points and
+    periods: next period's market resources, consumption and marginal value at every (shock node, grid
+    point), and the interpolation nodes and extrapolation of each period's consumption function.
+    """
+
+    def __init__(self, shocks, points, periods):
+        self.mNrmNext = np.empty((shocks, points))
+        self.cNrmNext = np.empty((shocks, points))
+        self.cNrmCnst = np.empty((shocks, points))
+        self.alpha = np.empty((shocks, points))
+        self.mNrm = np.empty((periods, points + 1))
+        self.cNrm = np.empty((periods, points + 1))
+        self.mNrmMin = np.empty(periods)
+        self.intercept = np.empty(periods)
+        self.slope = np.empty(periods)
+
+
+def workspace(shocks, points, periods):
+    key = (shocks, points, periods)
+    ws = workspaces.get(key)
+    if ws is None:
+        ws = Workspace(shocks, points, periods)
+        workspaces[key] = ws
+    return ws
+
+
+def consumption(ws, t, mNrm, out):
+    """
+    Evaluate the consumption function of period t, stored in ws, at the market resources mNrm, as
+    LowerEnvelope(LinearInterp(...), constraint) would, into out.
+    """
+    x, y = ws.mNrm[t], ws.cNrm[t]
+    alpha = ws.alpha[: len(mNrm)]
+
+    # The unconstrained function: linear interpolation, NaN below the first node and decay extrapolation
+    # towards the limiting linear function above the last node
+    i = np.searchsorted(x[:-1], mNrm)
+    np.maximum(i, 1, out=i)
+    np.subtract(mNrm, x[i - 1], out=alpha)
+    alpha /= x[i] - x[i - 1]
+    np.multiply(1.0 - alpha, y[i - 1], out=out)
+    out += alpha * y[i]
+    out[mNrm < x[0]] = np.nan
+    above = mNrm > x[-1]
+    if above.any():
+        slope_at_top = (y[-1] - y[-2]) / (x[-1] - x[-2])
+        level_diff = ws.intercept[t] + ws.slope[t] * x[-1] - y[-1]
+        decay = -(ws.slope[t] - slope_at_top) / level_diff
+        out[above] = (
+            ws.intercept[t]
+            + ws.slope[t] * mNrm[above]
+            - level_diff * np.exp(-decay * (mNrm[above] - x[-1]))
+        )
+
+    # The constrained function c = m - mNrmMin, NaN below mNrmMin
+    mNrmMin = ws.mNrmMin[t]
+    cnst = ws.cNrmCnst[: len(mNrm)]
+    np.subtract(mNrm, mNrmMin, out=cnst)
+    cnst /= (mNrmMin + 1.0) - mNrmMin
+    cnst[mNrm < mNrmMin] = np.nan
+    np.minimum(out, cnst, out=out)
+    return out
+
+
+def solve(params):
+    """
+    Solve the consumer with the given parameters (see supports) and return its consumption functions,
+    one per period followed by the terminal one, like the unpacked cFunc of a solved HARK consumer.
+    """
+    p = Parameters(params)
+    T = p.T_cycle
+    aXtraGrid = asset_grid(p)
+    BoroCnstArt = p.BoroCnstArt
+    if not isinstance(BoroCnstArt, (list, tuple, np.ndarray)):
+        BoroCnstArt = [BoroCnstArt] * T
+
+    dstns = [
+        income_dstn(
+            p.PermShkStd[t],
+            p.PermShkCount,
+            p.TranShkStd[t],
+            p.TranShkCount,
+            p.UnempPrb,
+            p.IncUnemp,
+        )
+        for t in range(T)
+    ]
+    ws = workspace(max(dstn[0].size for dstn in dstns), aXtraGrid.size, T)
+    CRRA, Rfree = p.CRRA, p.Rfree
+
+    # Terminal period: consume everything
+    mNrmMinNext, hNrmNext, MPCminNext = 0.0, 0.0, 1.0
+    for t in reversed(range(T)):
+        counters.period(t)
+        PermShkVals, TranShkVals, ShkPrbs = dstns[t]
+        shocks = PermShkVals.size
+        PermGroFac = p.PermGroFac[t]
+        DiscFacEff = p.DiscFac * p.LivPrb[t]
+
+        # Bounding MPC and human wealth, which give the limiting linear function of consumption
+        PatFac = ((Rfree * DiscFacEff) ** (1.0 / CRRA)) / Rfree
+        MPCminNow = 1.0 / (1.0 + PatFac / MPCminNext)
+        hNrmNow = (
+            PermGroFac / Rfree * (np.dot(ShkPrbs, TranShkVals * PermShkVals) + hNrmNext)
+        )
+
+        # Natural and artificial borrowing constraints
+        BoroCnstNat = (
+            (mNrmMinNext - TranShkVals.min()) * (PermGroFac * PermShkVals.min()) / Rfree
+        )
+        if BoroCnstArt[t] is None:
+            mNrmMinNow = BoroCnstNat
+        else:
+            mNrmMinNow = max(BoroCnstNat, BoroCnstArt[t])
+
+        # End-of-period marginal value at every end-of-period asset level, as the expectation of next
+        # period's marginal value over the shock nodes
+        aNrm = aXtraGrid + BoroCnstNat
+        mNrmNext = ws.mNrmNext[:shocks]
+        cNrmNext = ws.cNrmNext[:shocks]
+        np.multiply(
+            (Rfree / (PermGroFac * PermShkVals))[:, np.newaxis], aNrm, out=mNrmNext
+        )
+        mNrmNext += TranShkVals[:, np.newaxis]
+        if t == T - 1:
+            # The terminal consumption function c = m, NaN below zero
+            np.copyto(cNrmNext, mNrmNext)
+            cNrmNext[mNrmNext < 0.0] = np.nan
+            counters.add("interpolant_points", mNrmNext.size)
+        else:
+            consumption(ws, t + 1, mNrmNext, cNrmNext)
+            counters.add("interpolant_points", 2 * mNrmNext.size)
+        counters.add("expectation_nodes", mNrmNext.size)
+        cNrmNext **= -CRRA
+        cNrmNext *= (PermShkVals ** (-CRRA) * ShkPrbs)[:, np.newaxis]
+        EndOfPrdvP = DiscFacEff * Rfree * PermGroFac ** (-CRRA) * cNrmNext.sum(axis=0)
+
+        # Invert the first order condition for the endogenous grid of this period
+        x, y = ws.mNrm[t], ws.cNrm[t]
+        x[0], y[0] = BoroCnstNat, 0.0
+        np.power(EndOfPrdvP, -1.0 / CRRA, out=y[1:])
+        counters.add("utility_inverse", EndOfPrdvP.size)
+        np.add(y[1:], aNrm, out=x[1:])
+        ws.mNrmMin[t] = mNrmMinNow
+        ws.intercept[t] = MPCminNow * hNrmNow
+        ws.slope[t] = MPCminNow
+
+        mNrmMinNext, hNrmNext, MPCminNext = mNrmMinNow, hNrmNow, MPCminNow
+
+    cFunc = []
+    for t in range(T):
+        counters.period(t)
+        cFunc.append(
+            LowerEnvelope(
+                LinearInterp(ws.mNrm[t], ws.cNrm[t], ws.intercept[t], ws.slope[t]),
+                LinearInterp(
+                    np.array([ws.mNrmMin[t], ws.mNrmMin[t] + 1]), np.array([0.0, 1.0])
+                ),
+                nan_bool=False,
+            )
+        )
+    counters.period(T)
+    cFunc.append(LinearInterp([0.0, 1.0], [0.0, 1.0]))
+    return cFunc
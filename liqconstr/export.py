@@ -0,0 +1,87 @@
+"""
+Streaming export of consumption functions evaluated on long wealth grids.
+
+The tables saved next to each figure (Figures/*.txt) hold the wealth grid in the first column and one
+consumption function per remaining column. Instead of building the whole grid and every column before
+writing, the functions here walk the grid in chunks, evaluate each function on one chunk at a time and
+append the rows to the output file, so peak memory depends on the chunk size rather than on the length
+of the grid.
+"""
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+# Number of grid points evaluated and written at a time
+chunk_size = 2**16
+
+
+def iter_grid(start, stop, num, chunk=None):
+    """
+    Yield consecutive pieces of np.linspace(start, stop, num) without ever holding the whole grid.
+    Each point is computed exactly as np.linspace computes it, so the pieces concatenate to the same
+    array.
+    """
+    chunk = chunk or chunk_size
+    step = (stop - start) / (num - 1) if num > 1 else 0.0
+    for first in range(0, num, chunk):
+        last = min(first + chunk, num)
+        x = np.arange(first, last, dtype=float) * step + start
+        if last == num and num > 1:
+            x[-1] = stop
+        yield x
+
+
+def iter_table(funcs, start, stop, num, chunk=None):
+    """
+    Yield the rows (x, funcs[0](x), funcs[1](x), ...) of a table over np.linspace(start, stop, num)
+    as arrays of shape (rows in chunk, 1 + len(funcs)).
+    """
+    for x in iter_grid(start, stop, num, chunk):
+        rows = np.empty((x.size, 1 + len(funcs)))
+        rows[:, 0] = x
+        for j, func in enumerate(funcs):
+            rows[:, j + 1] = func(x)
+        yield rows
+
+
+def write_table(path, funcs, start, stop, num, chunk=None):
+    """
+    Evaluate each function in funcs on np.linspace(start, stop, num) and stream the table to path.
+
+    A path ending in .npy is written as a binary numpy array of shape (num, 1 + len(funcs)), which can
+    be opened later with np.load(path, mmap_mode="r"). Any other path is written as text in the format
+    of the Figures/*.txt files: one row per grid point, every cell followed by a semicolon.
+    """
+    rows = iter_table(funcs, start, stop, num, chunk)
+    if str(path).endswith(".npy"):
+        with open(path, "wb") as table:
+            header = {
+                "descr": npy_format.dtype_to_descr(np.dtype(float)),
+                "fortran_order": False,
+                "shape": (num, 1 + len(funcs)),
+            }
+            npy_format.write_array_header_1_0(table, header)
+            for block in rows:
+                table.write(block.tobytes())
+    else:
+        with open(path, "w") as table:
+            for block in rows:
+                table.writelines(
+                    "".join(repr(cell) + ";" for cell in row) + "\n"
+                    for row in block.tolist()
+                )
+
+
+def read_table(path, mmap_mode=None):
+    """
+    Read a table written by write_table (or one of the Figures/*.txt files) back into an array of shape
+    (rows, columns). Text tables are parsed in one pass over the whole file rather than line by line; a
+    .npy table can be memory-mapped with mmap_mode="r".
+    """
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode=mmap_mode)
+    with open(path) as table:
+        text = table.read()
+    columns = text[: text.find("\n")].count(";")
+    values = np.array(text.replace(";", " ").split(), dtype=float)
+    return values.reshape(-1, columns)
@@ -0,0 +1,98 @@
+"""
+The consumers compared in each figure of the paper, declared as scenarios over the common lifecycle
+calibration in liqconstr.parameters. Each scenario records the period whose consumption function is
+plotted and the grid of market resources on which it is evaluated and saved to Figures/<name>.txt.
+"""
+
+import os
+
+from liqconstr.parameters import (
+    init_lifecycle,
+    init_lifecycle_risk1,
+    init_lifecycle_risk2,
+    init_lifecycle_risk3,
+)
+from liqconstr.scenario import Scenario
+
+# The directory of the figures and their tables, next to the liqconstr package
+figures_dir = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Figures"
+)
+
+# Counterclockwise Concavification: both risks and constraints are examples of counterclockwise
+# concavifications. Unconstrained perfect foresight, constrained perfect foresight, unconstrained with risk.
+counterclockwise_concavifications = Scenario(
+    init_lifecycle,
+    {
+        "unconstr": {},
+        "constraint": {
+            "BoroCnstArt": [None, -1, None, None, None, None, None, None, None, None]
+        },
+        "risk": init_lifecycle_risk1,
+    },
+    period=0,
+    grid=(-1, 1, 500),
+)
+
+# How a current constraint can hide a future kink: a perfect foresight consumer that faces one constraint in
+# period 2, and one that faces the same constraint plus one more constraint in period 3. "BoroCnstArt"
+# corresponds to big Tau in the paper, i.e. the set of future constraints ordered by time.
+curr_constr_hides_fut_kink = Scenario(
+    init_lifecycle,
+    {
+        "Bcons1": {
+            "BoroCnstArt": [None, 0, None, None, None, None, None, None, None, None]
+        },
+        "BCons2": {
+            "BoroCnstArt": [None, 0, 0.02, None, None, None, None, None, None, None]
+        },
+    },
+    period=0,
+    grid=(1, 1.2, 500),
+)
+
+# Consumption function with and without a constraint and a risk: the effect of risk is greater if there
+# already exists a constraint. Unconstrained perfect foresight, unconstrained with risk, constrained perfect
+# foresight, and constrained with risk.
+cons_with_without_constr_and_risk = Scenario(
+    init_lifecycle,
+    {
+        "unconstr": {},
+        "risk": init_lifecycle_risk2,
+        "constr": {
+            "BoroCnstArt": [None, None, -6, None, None, None, None, None, None, None]
+        },
+        "constr_risk": dict(
+            init_lifecycle_risk2,
+            BoroCnstArt=[None, None, -6, None, None, None, None, None, None, None],
+        ),
+    },
+    period=1,
+    grid=(-8, -4, 1000),
+)
+
+# An immediate constraint can hide a future risk: as above, but the risk is realized one period later.
+constr_hides_risk = Scenario(
+    init_lifecycle,
+    {
+        "unconstr": {},
+        "risk": init_lifecycle_risk3,
+        "constr": {
+            "BoroCnstArt": [None, None, -6, None, None, None, None, None, None, None]
+        },
+        "constr_risk": dict(
+            init_lifecycle_risk3,
+            BoroCnstArt=[None, None, -6, None, None, None, None, None, None, None],
+        ),
+    },
+    period=1,
+    grid=(-8, -4, 1000),
+)
+
+# The scenarios by the name of the figure (and of its table in Figures/)
+scenarios = {
+    "CounterclockwiseConcavifications": counterclockwise_concavifications,
+    "CurrConstrHidesFutKink": curr_constr_hides_fut_kink,
+    "ConsWithWithoutConstrAndRisk": cons_with_without_constr_and_risk,
+    "ConstrHidesRisk": constr_hides_risk,
+}
@@ -0,0 +1,107 @@
+"""
+Text labels for the figures, typeset once and reused.
+
+The figures annotate consumption functions and kink points with short LaTeX labels such as
+$\\hat{c}_{t,2}$ or ${\\omega}_{t,1}^{1}$. Laid out as ordinary matplotlib text with usetex, every label is
+sent through TeX again whenever a figure is drawn. Here each label is instead converted once into the
+outline of its glyphs (a TextPath), kept in a process-wide cache keyed by the label and the font settings,
+and drawn as a filled path. With TeX the outlines come from matplotlib's on-disk tex.cache, so a label
+typeset in an earlier session is not typeset again; without TeX the labels fall back to mathtext.
+
+The labels placed with text() are those of the figures of the paper (liqconstr.plots, which the notebook
+and python -m liqconstr both draw with) and of the dashboard. The legends of the dashboard figures and the
+"kink that gets hidden" annotation are not: matplotlib lays them out itself (the legend at the best place
+for the current curves) and typesets their text with every render.
+"""
+
+import shutil
+
+import matplotlib.pyplot as plt
+from matplotlib import rcParams, transforms
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import PathPatch
+from matplotlib.textpath import TextPath
+
+# Outlines of the labels rendered so far, keyed by (label, fontsize, font settings)
+label_paths = {}
+
+
+def tex_available():
+    """
+    Whether a LaTeX installation that matplotlib can use for text layout is on the PATH.
+    """
+    return shutil.which("latex") is not None and shutil.which("dvipng") is not None
+
+
+def use_tex(usetex=None):
+    """
+    Set up matplotlib to lay out all text in the figures with LaTeX, in a serif font. If usetex is None,
+    LaTeX is used only if it is installed; otherwise text falls back to matplotlib's mathtext with the
+    Computer Modern fonts. Returns whether LaTeX is used.
+    """
+    if usetex is None:
+        usetex = tex_available()
+    plt.rc("text", usetex=usetex)
+    plt.rc("font", family="serif")
+    if not usetex:
+        plt.rc("mathtext", fontset="cm")
+    return usetex
+
+
+def font_settings():
+    return (
+        rcParams["text.usetex"],
+        tuple(rcParams["font.family"]),
+        rcParams["mathtext.fontset"],
+    )
+
+
+def label_path(s, fontsize=14):
+    """
+    Return the outline of the label s at the given font size (in points), from the cache if it has
+    already been rendered with the current font settings.
+    """
+    key = (s, fontsize, font_settings())
+    path = label_paths.get(key)
+    if path is None:
+        path = TextPath(
+            (0, 0),
+            s,
+            size=fontsize,
+            prop=FontProperties(family=rcParams["font.family"]),
+            usetex=rcParams["text.usetex"],
+        )
+        label_paths[key] = path
+    return path
+
+
+def warm(labels, fontsize=14):
+    """
+    Render all of the given labels ahead of time, so that drawing the figures does not have to.
+    """
+    for s in labels:
+        label_path(s, fontsize)
+
+
+def text(x, y, s, fontsize=14, color="black", ax=None):
+    """
+    Draw the label s with the left end of its baseline at (x, y) in data coordinates, like
+    plt.text(x, y, s, fontsize=fontsize), but from the cached outline of the label.
+    """
+    if ax is None:
+        ax = plt.gca()
+    transform = (
+        transforms.Affine2D().scale(1 / 72)
+        + ax.figure.dpi_scale_trans
+        + transforms.ScaledTranslation(x, y, ax.transData)
+    )
+    patch = PathPatch(
+        label_path(s, fontsize),
+        transform=transform,
+        facecolor=color,
+        edgecolor="none",
+        clip_on=False,
+        zorder=3,
+    )
+    ax.add_artist(patch)
+    return patch
@@ -0,0 +1,63 @@
+"""
+Parameters of the lifecycle consumers whose consumption functions appear in the figures.
+
+All consumers start from HARK's ten-period lifecycle calibration, stripped of growth, mortality, income
+risk and borrowing constraints; the risky variants then add back a single source of income risk.
+"""
+
+from HARK.ConsumptionSaving.ConsIndShockModel import (
+    init_lifecycle as init_lifecycle_HARK,
+)
+
+# Common parameters for all models (the initialized lifecycle perfect foresight type with no borrowing constraint)
+
+# load default parameteres from the lifecycle model in the HARK toolbox
+init_lifecycle = dict(init_lifecycle_HARK)
+
+# remove all risk and growth factors, borrowing constraints, and set the solver to always use linear interpolation
+init_lifecycle["PermGroFac"] = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+init_lifecycle["LivPrb"] = [1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+init_lifecycle["DiscFac"] = 1 / 1.03
+init_lifecycle["T_retire"] = 11
+init_lifecycle["UnempPrb"] = 0
+init_lifecycle["TranShkStd"] = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+init_lifecycle["PermShkStd"] = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+init_lifecycle["BoroCnstArt"] = [
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+    None,
+]
+init_lifecycle["CubicBool"] = False
+# number of nodes in the discretized transitory shock distribution of the risky variants; more nodes give a
+# smoother expected marginal value at the cost of a proportionally longer solve
+init_lifecycle["TranShkCount"] = 7
+
+# add the second type of lifecycle agent with unemployment risk
+init_lifecycle_risk1 = dict(init_lifecycle)
+init_lifecycle_risk1["IncUnemp"] = 0.205
+init_lifecycle_risk1["UnempPrb"] = 0.05
+
+# 0.1955 and 0.05 to get a situation very similar to the constraint case asymptotically
+
+# the lifecycle type with only one-period transitory risk
+init_lifecycle_risk2 = dict(init_lifecycle)
+init_lifecycle_risk2["TranShkStd"] = [0, 0.5, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+# the lifecycle type with only one-period future transitory risk
+init_lifecycle_risk3 = dict(init_lifecycle)
+init_lifecycle_risk3["TranShkStd"] = [0, 0, 0, 0.5, 0, 0, 0, 0, 0, 0, 0]
+#
+init_lifecycle_risk4 = dict(init_lifecycle)
+init_lifecycle_risk4["TranShkStd"] = [0, 0, 0.5, 0, 0, 0, 0, 0, 0, 0, 0]
+
+init_lifecycle_risk5 = dict(init_lifecycle)
+init_lifecycle_risk5["TranShkStd"] = [0, 0.5, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+
+init_lifecycle_risk6 = dict(init_lifecycle)
+init_lifecycle_risk6["TranShkStd"] = [0, 0.5, 0.5, 0, 0, 0, 0, 0, 0, 0, 0]
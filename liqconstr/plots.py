@@ -0,0 +1,296 @@
+"""
+The figures of the paper, drawn from the curves of their scenarios in liqconstr.figures.
+
+Each function takes the Curves of its scenario (Scenario.evaluate()) and returns a new matplotlib figure.
+Both the notebook LiqConstr.ipynb and python -m liqconstr figures draw the figures with these functions. The
+labels are drawn from the outlines cached by liqconstr.labels, so they are typeset once per session rather than
+on every draw.
+"""
+
+import matplotlib.pyplot as plt
+
+from liqconstr import labels
+
+
+def counterclockwise_concavifications(curves):
+    """
+    Figure 1: the linear consumption function of a perfect foresight consumer, the kinked consumption
+    function of a consumer who faces a constraint, and the curved consumption function of a consumer that
+    faces risk.
+    """
+    x = curves.x
+    y, y2, y3 = curves
+
+    f = plt.figure()
+    plt.plot(x, y, color="black")
+    plt.plot(x, y2, color="black", linestyle="--")
+    plt.plot(x, y3, color="black", linestyle=":", linewidth=3)
+    plt.tick_params(
+        labelbottom=False,
+        labelleft=False,
+        left="off",
+        right="off",
+        bottom="off",
+        top="off",
+    )
+
+    labels.text(-1.2, 1.0, "$c$", fontsize=14)
+    labels.text(1.12, 0.42, "${m}$", fontsize=14)
+    labels.text(-0.25, 0.42, "${m}^{\\#}$", fontsize=14)
+    plt.plot([-0.23, -0.23], [0.45, 0.87], color="black", linestyle=":", linewidth=1)
+    plt.ylim(0.465, 1.0)
+
+    plt.arrow(
+        -0.6,
+        0.755,
+        0.1,
+        0,
+        head_width=0.01,
+        width=0.001,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        0.52,
+        0.865,
+        -0.1,
+        0,
+        head_width=0.01,
+        width=0.001,
+        facecolor="black",
+        length_includes_head="True",
+    )
+
+    labels.text(0.545, 0.86, "Risk", fontsize=10)
+    labels.text(-0.95, 0.75, "Constraint", fontsize=10)
+    return f
+
+
+def curr_constr_hides_fut_kink(curves):
+    """
+    Figure 2: a perfect foresight consumer that faces one constraint, and one that faces an additional
+    current constraint which hides the kink induced by the first.
+    """
+    x = curves.x
+    y, y2 = curves
+
+    f = plt.figure()
+    plt.plot(x, y, color="black")
+    plt.plot(x, y2, color="black")
+    labels.text(1.15, 1.01, "$\\hat{c}_{t,2}$", fontsize=14)
+    labels.text(1.07, 1.01, "$c_{t,1}$", fontsize=14)
+    plt.arrow(
+        1.149,
+        1.011,
+        -0.01,
+        0,
+        head_width=0.001,
+        width=0.0001,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        1.085,
+        1.011,
+        0.01,
+        0,
+        head_width=0.001,
+        width=0.0001,
+        facecolor="black",
+        length_includes_head="True",
+    )
+
+    plt.xlim(left=1.0, right=1.2)
+    plt.ylim(0.98, 1.025)
+    plt.tick_params(
+        labelbottom=False,
+        labelleft=False,
+        left="off",
+        right="off",
+        bottom="off",
+        top="off",
+    )
+
+    labels.text(0.99, 1.025, "$c$", fontsize=14)
+    labels.text(1.20, 0.978, "${m}$", fontsize=14)
+
+    labels.text(0.97, 1.0015, "$\\hat{c}_{t,2}(\\omega_{t,1})$", fontsize=14)
+    labels.text(0.988, 1.006, "${c}_{t,1}^{\\#}$", fontsize=14)
+    labels.text(0.988, 1.019, "$\\hat{c}_{t,1}^{\\#}$", fontsize=14)
+
+    labels.text(1.064, 0.977, "$\\omega_{t,1}$", fontsize=14)
+    labels.text(1.05, 0.977, "$\\hat{\\omega}_{t,2}$", fontsize=14)
+    labels.text(1.18, 0.977, "$\\hat{\\omega}_{t,1}$", fontsize=14)
+
+    plt.plot([1, 1.064], [1.0068, 1.0068], color="black", linestyle="--")
+    plt.plot([1, 1.064], [1.0015, 1.0015], color="black", linestyle="--")
+    plt.plot([1, 1.18], [1.019, 1.019], color="black", linestyle="--")
+    plt.plot([1.058, 1.058], [0.98, 1.0008], color="black", linestyle="--")
+    plt.plot([1.18, 1.18], [0.98, 1.019], color="black", linestyle="--")
+    plt.plot([1.064, 1.064], [1.0068, 0.98], color="black", linestyle="--")
+    return f
+
+
+def cons_with_without_constr_and_risk(curves):
+    """
+    Figure 3: consumption functions with and without a constraint and a risk.
+    """
+    x = curves.x
+    y, y2, y3, y4 = curves
+
+    f = plt.figure()
+    plt.plot(x, y, color="black", linewidth=3)
+    plt.plot(x, y2, color="black", linestyle="--", linewidth=3)
+    plt.plot(x, y3, color="black", linestyle=":", linewidth=3)
+    plt.plot(x, y4, color="black", linestyle="--")
+    plt.xlim(left=-8, right=-4.5)
+    plt.ylim(0, 0.30)
+    labels.text(-8.15, 0.305, "$c$", fontsize=14)
+    labels.text(-4.5, -0.02, "${m}$", fontsize=14)
+    labels.text(-6, 0.25, "${c}_{t,0}$", fontsize=14)
+    labels.text(-5.2, 0.25, r"$\tilde{c}_{t,0}$", fontsize=14)
+    labels.text(-7.45, 0.02, "${c}_{t,1}$", fontsize=14)
+    labels.text(-5.7, 0.05, r"$\tilde{c}_{t,1}$", fontsize=14)
+
+    plt.arrow(
+        -5.22,
+        0.255,
+        -0.1,
+        0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        -5.75,
+        0.255,
+        0.1,
+        0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        -5.75,
+        0.055,
+        -0.32,
+        0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        -7.25,
+        0.025,
+        0.45,
+        0.0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+
+    plt.plot([-6.5, -6.5], [0, 0.145], color="black", linestyle=":")
+    plt.plot([-5.88, -5.88], [0, 0.2], color="black", linestyle=":")
+
+    labels.text(-6.6, -0.02, r"${\omega}_{t,1}$", fontsize=14)
+    labels.text(-5.95, -0.02, r"$\bar{\omega}_{t,1}$", fontsize=14)
+
+    plt.tick_params(
+        labelbottom=False,
+        labelleft=False,
+        left="off",
+        right="off",
+        bottom="off",
+        top="off",
+    )
+    return f
+
+
+def constr_hides_risk(curves):
+    """
+    Figure 4: how an immediate constraint can hide a future risk.
+    """
+    x = curves.x
+    y1, y2, y3, y4 = curves
+
+    f = plt.figure()
+    plt.plot(x, y1, color="black", linestyle=":", linewidth=3)
+    plt.plot(x, y2, color="black", linewidth=3)
+    plt.plot(x, y3, color="black", linestyle="--", linewidth=3)
+    plt.xlim(left=-8, right=-5.5)
+    plt.ylim(0, 0.20)
+    labels.text(-8.15, 0.205, "$c$", fontsize=14)
+    labels.text(-5.55, -0.02, "${m}$", fontsize=14)
+    plt.plot([-6.58, -6.58], [0, 0.1], color="black", linestyle=":")
+    plt.plot([-6.48, -6.48], [0, 0.15], color="black", linestyle=":")
+    labels.text(-6.66, -0.02, r"${\omega}_{t,1}^{1}$", fontsize=14)
+    labels.text(-6.5, -0.02, r"${\omega}_{t,1}^{0}$", fontsize=14)
+
+    labels.text(-7.62, 0.05, r"${c}^{1}_{t,0}$", fontsize=14)
+    labels.text(-7.62, 0.075, r"${c}^{0}_{t,0}$", fontsize=14)
+    labels.text(-6.3, 0.05, r"${c}^{1}_{t,1}$", fontsize=14)
+    labels.text(-7.2, 0.115, r"${c}^{0}_{t,1}$", fontsize=14)
+
+    plt.arrow(
+        -7.02,
+        0.12,
+        0.42,
+        0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        -7.44,
+        0.08,
+        0.32,
+        0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        -6.32,
+        0.055,
+        -0.32,
+        0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+    plt.arrow(
+        -7.44,
+        0.055,
+        0.45,
+        0.0,
+        head_width=0.005,
+        head_length=0.05,
+        facecolor="black",
+        length_includes_head="True",
+    )
+
+    plt.tick_params(
+        labelbottom=False,
+        labelleft=False,
+        left="off",
+        right="off",
+        bottom="off",
+        top="off",
+    )
+    return f
+
+
+# The plotting function of each figure, by the name of its scenario in liqconstr.figures.scenarios
+plots = {
+    "CounterclockwiseConcavifications": counterclockwise_concavifications,
+    "CurrConstrHidesFutKink": curr_constr_hides_fut_kink,
+    "ConsWithWithoutConstrAndRisk": cons_with_without_constr_and_risk,
+    "ConstrHidesRisk": constr_hides_risk,
+}
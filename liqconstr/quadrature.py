@@ -0,0 +1,159 @@
+"""
+Expectations over next period's income shocks for the consumers with income risk.
+
+In each period of the backward induction, the end-of-period marginal value of assets is the expectation of
+next period's marginal value over the discretized income shocks. HARK's basic solver builds it from tiled
+(shock nodes x asset grid) copies of the shocks, the probabilities and the asset grid. RiskExpectationSolver
+instead evaluates all shock nodes times all grid points as a single broadcast operation on the shock
+vectors, and can split the asset grid into blocks that are evaluated on a pool of threads (numpy releases
+the GIL while it works on the blocks). The number of shock nodes is set by the usual TranShkCount and
+PermShkCount parameters, so accuracy can be traded against speed explicitly.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from HARK.core import makeOnePeriodOOSolver
+from HARK.ConsumptionSaving.ConsIndShockModel import (
+    ConsIndShockSolverBasic,
+    IndShockConsumerType,
+    MargValueFunc,
+)
+from HARK.interpolation import LowerEnvelope
+from HARK.utilities import CRRAutilityP
+
+from liqconstr import counters
+
+# Thread pools by number of threads, shared by all solvers in this process
+thread_pools = {}
+
+
+def thread_pool(threads):
+    pool = thread_pools.get(threads)
+    if pool is None:
+        pool = ThreadPoolExecutor(max_workers=threads)
+        thread_pools[threads] = pool
+    return pool
+
+
+def marginal_value(vPfunc, mNrm):
+    """
+    Evaluate the marginal value function vPfunc at the array mNrm. When consumption is the lower envelope
+    of the unconstrained function and the constraint lines, the envelope is taken with np.minimum rather
+    than by stacking the functions' values into one array and reducing it, as LowerEnvelope does.
+    """
+    if isinstance(vPfunc, MargValueFunc) and isinstance(vPfunc.cFunc, LowerEnvelope):
+        functions = vPfunc.cFunc.functions
+        cNrm = functions[0](mNrm)
+        for function in functions[1:]:
+            cNrm = np.minimum(cNrm, function(mNrm))
+        return CRRAutilityP(cNrm, gam=vPfunc.CRRA)
+    return vPfunc(mNrm)
+
+
+class RiskExpectationSolver(ConsIndShockSolverBasic):
+    """
+    Solver for one period of the consumption-saving problem with linear interpolation, as HARK's
+    ConsIndShockSolverBasic, whose expectation over next period's shocks is one broadcast operation,
+    optionally split over QuadThreads threads.
+    """
+
+    def __init__(
+        self,
+        solution_next,
+        IncomeDstn,
+        LivPrb,
+        DiscFac,
+        CRRA,
+        Rfree,
+        PermGroFac,
+        BoroCnstArt,
+        aXtraGrid,
+        vFuncBool,
+        CubicBool,
+        QuadThreads=1,
+    ):
+        ConsIndShockSolverBasic.__init__(
+            self,
+            solution_next,
+            IncomeDstn,
+            LivPrb,
+            DiscFac,
+            CRRA,
+            Rfree,
+            PermGroFac,
+            BoroCnstArt,
+            aXtraGrid,
+            vFuncBool,
+            CubicBool,
+        )
+        self.QuadThreads = QuadThreads
+
+        # A consumer makes one solver per period, from its last period backwards
+        counters.next_period()
+
+    def prepareToCalcEndOfPrdvP(self):
+        """
+        Make the grid of end-of-period assets, from the natural borrowing constraint up. Unlike HARK's
+        solver, nothing is tiled across the shock nodes here.
+        """
+        self.aNrmNow = np.asarray(self.aXtraGrid) + self.BoroCnstNat
+        return self.aNrmNow
+
+    def calcEndOfPrdvP(self):
+        """
+        Calculate end-of-period marginal value of assets at each point in aNrmNow, as the probability
+        weighted sum of next period's marginal value across the shock nodes.
+        """
+        # Shock-node quantities as column vectors, to broadcast against rows of end-of-period assets
+        PermShkVals = self.PermShkValsNext[:, np.newaxis]
+        TranShkVals = self.TranShkValsNext[:, np.newaxis]
+        ShkPrbs = self.ShkPrbsNext[:, np.newaxis]
+        PermShkValsPow = PermShkVals ** (-self.CRRA)
+        Rnrm = self.Rfree / (self.PermGroFac * PermShkVals)
+
+        def expectation(aNrm):
+            mNrmNext = Rnrm * aNrm + TranShkVals
+            return np.sum(
+                PermShkValsPow * marginal_value(self.vPfuncNext, mNrmNext) * ShkPrbs,
+                axis=0,
+            )
+
+        counters.add("expectation_nodes", PermShkVals.size * self.aNrmNow.size)
+        if self.QuadThreads > 1:
+            blocks = np.array_split(self.aNrmNow, self.QuadThreads)
+            vPnext = np.concatenate(
+                list(thread_pool(self.QuadThreads).map(expectation, blocks))
+            )
+        else:
+            vPnext = expectation(self.aNrmNow)
+
+        EndOfPrdvP = (
+            self.DiscFacEff * self.Rfree * self.PermGroFac ** (-self.CRRA) * vPnext
+        )
+        return EndOfPrdvP
+
+    def getPointsForInterpolation(self, EndOfPrdvP, aNrmNow):
+        counters.add("utility_inverse", np.size(EndOfPrdvP))
+        return ConsIndShockSolverBasic.getPointsForInterpolation(
+            self, EndOfPrdvP, aNrmNow
+        )
+
+
+class RiskConsumerType(IndShockConsumerType):
+    """
+    An IndShockConsumerType that solves its periods with RiskExpectationSolver. QuadThreads (default 1)
+    sets the number of threads used for the expectation over shocks. Consumers that request cubic
+    interpolation or the value function keep HARK's own solver.
+    """
+
+    time_inv_ = IndShockConsumerType.time_inv_ + ["QuadThreads"]
+
+    def __init__(self, cycles=1, verbose=1, quiet=False, **kwds):
+        params = {"QuadThreads": 1}
+        params.update(kwds)
+        IndShockConsumerType.__init__(
+            self, cycles=cycles, verbose=verbose, quiet=quiet, **params
+        )
+        if not self.CubicBool and not self.vFuncBool:
+            self.solveOnePeriod = makeOnePeriodOOSolver(RiskExpectationSolver)
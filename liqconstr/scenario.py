@@ -0,0 +1,298 @@
+"""
+Declarative comparisons of lifecycle consumers that differ from a common calibration.
+
+Every figure compares a handful of consumers (IndShockConsumerType agents, solved here by liqconstr.egm
+or as RiskConsumerType) that share a base parameter dictionary and differ in a few entries, typically
+the borrowing constraints BoroCnstArt or the income risk. A Scenario declares the base dictionary and the
+named variants, solves each distinct agent once, and evaluates the consumption functions of all
+variants on a common grid of market resources.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from liqconstr import counters, derivatives, egm
+from liqconstr.quadrature import RiskConsumerType
+
+# The solver of the agents: "egm" solves the agents that liqconstr.egm supports with its array-based
+# solver (and the others with HARK), "hark" solves every agent as a HARK consumer type
+solver = "egm"
+
+# Solved consumption functions, keyed by the full parameter set of the agent that produced them. The
+# cache is shared by all scenarios, so an agent that appears in several figures (or is requested again
+# by the dashboard with the same slider values) is only solved once.
+solved_cFuncs = OrderedDict()
+cache_size = 512
+
+
+def parameter_key(params):
+    """
+    Return a hashable version of a parameter dictionary, used to recognize identical agents.
+    """
+
+    def freeze(value):
+        if isinstance(value, dict):
+            return tuple(sorted((key, freeze(val)) for key, val in value.items()))
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return tuple(freeze(val) for val in value)
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    return freeze(params)
+
+
+def solve_agent(params):
+    """
+    Make a lifecycle consumer with the given parameters, with a borrowing constraint BoroCnstArt that
+    varies over time, solve it with the configured solver, and return its list of consumption functions
+    (one per period).
+    """
+    if solver == "egm" and egm.supports(params):
+        with counters.agent(params, "egm"):
+            return egm.solve(params)
+
+    with counters.agent(params, "hark"):
+        agent = RiskConsumerType(**params)
+        agent.delFromTimeInv("BoroCnstArt")
+        agent.addToTimeVary("BoroCnstArt")
+        agent.solve()
+        agent.unpack("cFunc")
+    return agent.cFunc
+
+
+def solve_agents(param_sets, jobs=1):
+    """
+    Return the consumption functions for each parameter dictionary in param_sets. Agents already in the
+    cache are not solved again, duplicates in param_sets are solved once, and with jobs > 1 the remaining
+    agents are solved in that many worker processes.
+    """
+    keys = [(solver, parameter_key(params)) for params in param_sets]
+    missing = OrderedDict()
+    for key, params in zip(keys, param_sets):
+        if key not in solved_cFuncs:
+            missing[key] = params
+
+    if jobs > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(missing))) as executor:
+            solutions = list(executor.map(solve_agent, missing.values()))
+    else:
+        solutions = [solve_agent(params) for params in missing.values()]
+
+    for key, cFunc in zip(missing, solutions):
+        solved_cFuncs[key] = cFunc
+
+    cFuncs = []
+    for key in keys:
+        solved_cFuncs.move_to_end(key)
+        cFuncs.append(solved_cFuncs[key])
+    while len(solved_cFuncs) > max(cache_size, len(set(keys))):
+        solved_cFuncs.popitem(last=False)
+    return cFuncs
+
+
+class Curves:
+    """
+    Consumption functions (or their derivatives) of several agents evaluated on one grid: labels[i] names
+    the agent in row i of the (agents x points) array values, and x holds the grid. A single agent's row can be looked up by
+    label, e.g. curves["risk"].
+    """
+
+    def __init__(self, labels, x, values):
+        self.labels = list(labels)
+        self.x = x
+        self.values = values
+
+    def __getitem__(self, label):
+        return self.values[self.labels.index(label)]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class Scenario:
+    """
+    A set of consumers declared as a base parameter dictionary plus named variants, each variant being a
+    dictionary of parameters that override the base. Optionally records the period and the grid
+    (start, stop, num) at which a figure evaluates the consumption functions.
+    """
+
+    def __init__(self, base, variants, period=0, grid=None):
+        self.base = base
+        self.variants = OrderedDict(variants)
+        self.period = period
+        self.grid = grid
+
+    @property
+    def labels(self):
+        return list(self.variants)
+
+    def params(self, label):
+        """
+        Return the full parameter dictionary of one variant.
+        """
+        params = dict(self.base)
+        params.update(self.variants[label])
+        return params
+
+    def solve(self, jobs=1):
+        """
+        Solve every variant (each distinct agent once) and return a dictionary mapping each label to
+        that agent's list of consumption functions.
+        """
+        cFuncs = solve_agents([self.params(label) for label in self.labels], jobs)
+        return OrderedDict(zip(self.labels, cFuncs))
+
+    def functions(self, period=None, jobs=1):
+        """
+        Return the consumption functions of all variants in one period (by default the scenario's own
+        period), in the order of labels.
+        """
+        if period is None:
+            period = self.period
+        return [cFunc[period] for cFunc in self.solve(jobs).values()]
+
+    def evaluate(self, x=None, period=None, jobs=1):
+        """
+        Evaluate the period consumption function of every variant on the grid x (by default the
+        scenario's own period and grid) and return them as Curves.
+        """
+        if x is None:
+            x = np.linspace(*self.grid, endpoint=True)
+
+        functions = self.functions(period, jobs)
+        values = np.empty((len(functions), np.size(x)))
+        for row, function in zip(values, functions):
+            row[:] = function(x)
+        return Curves(self.labels, x, values)
+
+    def mpc(self, x=None, period=None, jobs=1):
+        """
+        Like evaluate, but for the marginal propensity to consume c'(x) of every variant.
+        """
+        if x is None:
+            x = np.linspace(*self.grid, endpoint=True)
+        return Curves(self.labels, x, derivatives.mpc(self.functions(period, jobs), x))
+
+    def curvature(self, x=None, period=None, jobs=1):
+        """
+        Like evaluate, but for the curvature c''(x) of every variant's consumption function.
+        """
+        if x is None:
+            x = np.linspace(*self.grid, endpoint=True)
+        return Curves(
+            self.labels, x, derivatives.curvature(self.functions(period, jobs), x)
+        )
+
+    def prudence(self, x=None, period=None, jobs=1):
+        """
+        Like evaluate, but for the prudence -v'''(x)/v''(x) of every variant's value function.
+        """
+        if x is None:
+            x = np.linspace(*self.grid, endpoint=True)
+        CRRA = [self.params(label)["CRRA"] for label in self.labels]
+        return Curves(
+            self.labels, x, derivatives.prudence(self.functions(period, jobs), x, CRRA)
+        )
+
+
+class ReactiveScenario:
+    """
+    A scenario whose agents depend on named inputs, such as the sliders of a dashboard figure. Each agent is
+    declared as (inputs, variant): the names of the inputs it depends on and a function that takes their values
+    and returns the agent's variant of the base parameters.
+
+    evaluate() keeps the row of every agent from the previous render, and only solves and evaluates again the
+    agents whose inputs changed (or all of them, if the grid changed), so that moving one slider leaves the
+    curves of the agents that do not depend on it alone. The names of the agents computed by the last call are
+    in recomputed. If archive is set to an Archive of a sweep of the same agents (see liqconstr.archive and
+    Archive.check), the consumption functions of the input values and grid that it holds are read from it
+    instead of solved, as long as it was solved by the current solver.
+    """
+
+    def __init__(self, base, agents, period=0):
+        self.base = base
+        self.agents = OrderedDict(agents)
+        self.period = period
+        self.rendered = {}
+        self.recomputed = []
+        self.archive = None
+
+    @property
+    def labels(self):
+        return list(self.agents)
+
+    def clear(self):
+        """
+        Forget the rows of the previous render, so that the next one solves and evaluates every agent.
+        """
+        self.rendered.clear()
+
+    def inputs(self, label, values):
+        """
+        The values of the inputs that one agent depends on, from the dictionary of all input values.
+        """
+        return tuple(values[name] for name in self.agents[label][0])
+
+    def variants(self, values, labels=None):
+        """
+        The variant of every agent (or of the given labels) at the given input values.
+        """
+        if labels is None:
+            labels = self.labels
+        return OrderedDict(
+            (label, self.agents[label][1](*self.inputs(label, values)))
+            for label in labels
+        )
+
+    def scenario(self, values, labels=None):
+        """
+        The Scenario of the agents (or of the given labels) at the given input values.
+        """
+        return Scenario(self.base, self.variants(values, labels), self.period)
+
+    def evaluate(self, values, x, labels=None, kind="evaluate"):
+        """
+        Evaluate the agents (or the given labels) at the given input values on the grid x, as Scenario.evaluate,
+        or Scenario.curvature etc. if kind names that method, and return them as Curves.
+        """
+        if labels is None:
+            labels = self.labels
+        grid = np.asarray(x, dtype=np.float64).tobytes()
+
+        changed = []
+        for label in labels:
+            key = self.inputs(label, values)
+            rendered = self.rendered.get((kind, label))
+            if rendered is None or rendered[0] != key or rendered[1] != grid:
+                changed.append(label)
+
+        archived = None
+        if (
+            changed
+            and kind == "evaluate"
+            and self.archive is not None
+            and self.archive.solver == solver
+        ):
+            archived = self.archive.rows(values, changed, self.period, x)
+        if changed:
+            if archived is not None:
+                curves = archived
+            else:
+                curves = getattr(self.scenario(values, changed), kind)(x)
+            for label, row in zip(changed, curves):
+                self.rendered[(kind, label)] = (
+                    self.inputs(label, values),
+                    grid,
+                    np.array(row),
+                )
+        self.recomputed = changed
+
+        return Curves(
+            labels, x, np.array([self.rendered[(kind, label)][2] for label in labels])
+        )
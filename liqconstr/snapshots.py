@@ -0,0 +1,110 @@
+"""
+Check that the figures' consumption functions still reproduce the tables stored in Figures/.
+
+Each figure's table (Figures/<name>.txt) holds the grid of market resources and the consumption function
+of every agent in the figure. The functions here regenerate these curves with the current solver, from
+the scenarios in liqconstr.figures, and compare them with the stored tables within a tolerance, so that
+changes to the solver or an upgrade of HARK can be checked against the published figures in a few
+seconds. Run as
+
+    python -m liqconstr.snapshots [figure ...]
+
+to check the given figures (by default all of them); the exit status is nonzero if any of them differ.
+"""
+
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from liqconstr.export import read_table
+from liqconstr.figures import figures_dir, scenarios
+
+# Tolerances of the comparison, as in np.isclose. Regenerating the tables with the same solver reproduces
+# them to about 1e-15.
+rtol = 1e-9
+atol = 1e-12
+
+Snapshot = namedtuple("Snapshot", ["figure", "ok", "max_diff", "message"])
+Snapshot.__doc__ = """
+The result of comparing one figure's regenerated curves with its stored table: whether they agree, the
+largest absolute difference, and a description of the first disagreement (empty if they agree).
+"""
+
+
+def compare(figure, directory=None, rtol=None, atol=None, jobs=1):
+    """
+    Regenerate the curves of one figure and compare them with its table in directory (by default
+    Figures/), returning a Snapshot. Missing values (NaN, e.g. below the natural borrowing constraint)
+    must be missing in both.
+    """
+    if directory is None:
+        directory = figures_dir
+    if rtol is None:
+        rtol = globals()["rtol"]
+    if atol is None:
+        atol = globals()["atol"]
+
+    stored = read_table(os.path.join(directory, figure + ".txt"))
+    scenario = scenarios[figure]
+    if stored.shape != (scenario.grid[2], 1 + len(scenario.labels)):
+        return Snapshot(
+            figure,
+            False,
+            np.inf,
+            "table has shape %s, expected %s"
+            % (stored.shape, (scenario.grid[2], 1 + len(scenario.labels))),
+        )
+
+    curves = scenario.evaluate(jobs=jobs)
+    regenerated = np.column_stack([curves.x] + list(curves))
+
+    missing = np.isnan(stored)
+    diff = np.abs(np.where(missing, 0.0, regenerated - stored))
+    max_diff = float(diff[~np.isnan(diff)].max(initial=0))
+    close = np.isclose(regenerated, stored, rtol=rtol, atol=atol, equal_nan=True)
+    if close.all():
+        return Snapshot(figure, True, max_diff, "")
+
+    row, column = np.argwhere(~close)[0]
+    name = "x" if column == 0 else scenario.labels[column - 1]
+    message = (
+        "%d values differ, first %s at x = %.17g: stored %.17g, regenerated %.17g"
+        % (
+            np.count_nonzero(~close),
+            name,
+            stored[row, 0],
+            stored[row, column],
+            regenerated[row, column],
+        )
+    )
+    return Snapshot(figure, False, max_diff, message)
+
+
+def check(figures=None, directory=None, rtol=None, atol=None, jobs=1):
+    """
+    Compare the given figures (by default all of them) with their stored tables and return the Snapshots.
+    """
+    if figures is None:
+        figures = list(scenarios)
+    return [compare(figure, directory, rtol, atol, jobs) for figure in figures]
+
+
+def main(figures=None):
+    snapshots = check(figures or None)
+    for snapshot in snapshots:
+        print(
+            "%-34s %-6s max diff %.2e  %s"
+            % (
+                snapshot.figure,
+                "ok" if snapshot.ok else "FAILED",
+                snapshot.max_diff,
+                snapshot.message,
+            )
+        )
+    return 0 if all(snapshot.ok for snapshot in snapshots) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,223 @@
+"""
+Levels of market resources that shape a consumption function, computed from the parameters alone.
+
+Before solving a consumer it is often enough to know where its consumption function can be drawn at all
+and where its constraints stop binding, e.g. to decide whether the kinks of a figure fall inside the
+plotted window. Both follow from the parameters without solving the consumer:
+
+  - the lowest market resources at which consumption is defined, from the natural borrowing constraint
+    implied by the worst income shocks and from the artificial constraints BoroCnstArt;
+  - omega, the market resources above which none of the artificial constraints binds for a perfect
+    foresight consumer (the kink omega_{t,1} of the paper). With risk, the consumer stays away from the
+    constraints at even higher resources, so omega is a lower bound for the kink of a risky consumer.
+
+With risk, the threshold omega-bar above which a constraint no longer affects consumption takes one solve
+of the consumer without that constraint, after which omega_bar finds it for any number of constraint levels
+by inverting the consumer's savings function. omega_curve and omega_bar_surface give both thresholds as
+functions of the constraint level (and of the risk) for whole arrays of them.
+"""
+
+import numpy as np
+
+from liqconstr import derivatives
+from liqconstr.egm import Parameters, income_dstn
+
+
+def constraints(p):
+    BoroCnstArt = p.BoroCnstArt
+    if not isinstance(BoroCnstArt, (list, tuple, np.ndarray)):
+        BoroCnstArt = [BoroCnstArt] * p.T_cycle
+    return BoroCnstArt
+
+
+def lowest_resources(params, period):
+    """
+    The market resources below which the consumption function of the given period is not defined (NaN):
+    the larger of the natural borrowing constraint and the artificial one in that period.
+    """
+    p = Parameters(params)
+    BoroCnstArt = constraints(p)
+    mNrmMin = 0.0
+    for t in reversed(range(period, p.T_cycle)):
+        PermShkVals, TranShkVals, _ = income_dstn(
+            p.PermShkStd[t],
+            p.PermShkCount,
+            p.TranShkStd[t],
+            p.TranShkCount,
+            p.UnempPrb,
+            p.IncUnemp,
+        )
+        mNrmMin = (
+            (mNrmMin - TranShkVals.min())
+            * (p.PermGroFac[t] * PermShkVals.min())
+            / p.Rfree
+        )
+        if BoroCnstArt[t] is not None:
+            mNrmMin = max(mNrmMin, BoroCnstArt[t])
+    return mNrmMin
+
+
+def savings_plan(p, period):
+    """
+    The end-of-period assets a_t along the unconstrained perfect foresight plan from the given period on, by
+    period t, each as the (slope, intercept) of a linear function of market resources m in the given period.
+
+    The plan is linear in m: consumption grows by the factor (DiscFac LivPrb Rfree)^(1/CRRA) / PermGroFac from
+    one period to the next and exhausts resources in the terminal period.
+    """
+    # Market resources, consumption and end-of-period assets along the plan, as coefficients on
+    # (m, c, 1) where m and c are market resources and consumption in the given period
+    mNrm = np.array([1.0, 0.0, 0.0])
+    cNrm = np.array([0.0, 1.0, 0.0])
+    aNrm = {}
+    for t in range(period, p.T_cycle):
+        aNrm[t] = mNrm - cNrm
+        growth = (p.DiscFac * p.LivPrb[t] * p.Rfree) ** (1.0 / p.CRRA)
+        mNrm = p.Rfree / p.PermGroFac[t] * aNrm[t] + np.array([0.0, 0.0, 1.0])
+        cNrm = growth / p.PermGroFac[t] * cNrm
+
+    # Terminal period: nothing is left, which pins down c as a linear function of m
+    left = mNrm - cNrm
+    c_of_m = -np.array([left[0], left[2]]) / left[1]
+
+    return {
+        t: (a[0] + a[1] * c_of_m[0], a[2] + a[1] * c_of_m[1]) for t, a in aNrm.items()
+    }
+
+
+def omega(params, period):
+    """
+    The market resources in the given period above which no artificial borrowing constraint binds for a
+    perfect foresight consumer with the same parameters (income equal to its mean in every period), or
+    -inf if the consumer faces no constraint from this period on.
+
+    A constraint a_s >= BoroCnstArt[s] binds exactly when the unconstrained plan (see savings_plan) violates
+    it, i.e. below the m at which the planned a_s equals BoroCnstArt[s]; omega is the largest of these levels.
+    """
+    p = Parameters(params)
+    BoroCnstArt = constraints(p)
+    plan = savings_plan(p, period)
+
+    levels = [-np.inf]
+    for t in range(period, p.T_cycle):
+        if BoroCnstArt[t] is None:
+            continue
+        slope, intercept = plan[t]
+        levels.append((BoroCnstArt[t] - intercept) / slope)
+    return max(levels)
+
+
+def without_constraint(params, constraint_period):
+    p = Parameters(params)
+    BoroCnstArt = list(constraints(p))
+    BoroCnstArt[constraint_period] = None
+    return dict(params, BoroCnstArt=BoroCnstArt)
+
+
+def omega_curve(params, period, constraint_period, levels):
+    """
+    omega (see omega) of the perfect foresight consumers with the given parameters, except for a constraint at
+    each of the given levels in constraint_period, as an array with the shape of levels. The threshold of a
+    single constraint is linear in its level, so the whole curve costs no more than one value.
+    """
+    p = Parameters(params)
+    slope, intercept = savings_plan(p, period)[constraint_period]
+    others = omega(without_constraint(params, constraint_period), period)
+    return np.maximum((np.asarray(levels, dtype=float) - intercept) / slope, others)
+
+
+def resources_saving(cFunc, levels, tol=1e-12):
+    """
+    The market resources at which the consumer with the consumption function cFunc saves each of the given
+    levels of end-of-period assets, or -inf for levels below its lowest savings.
+
+    Savings m - cFunc(m) increase with m. Between the breakpoints of a piecewise linear cFunc they are linear,
+    so levels bracketed by two breakpoints are found exactly by linear interpolation. Levels above the last
+    breakpoint, where HARK extrapolates, are bracketed by doubling the distance from it and found by bisection.
+    """
+    points = derivatives.breakpoints(cFunc)
+    savings = points - cFunc(points)
+    finite = np.isfinite(savings)
+    points, savings = points[finite], savings[finite]
+
+    levels = np.asarray(levels, dtype=float)
+    mNrm = np.interp(levels, savings, points)
+    mNrm[levels < savings[0]] = -np.inf
+
+    above = np.flatnonzero(levels > savings[-1])
+    if above.size:
+        target = levels[above]
+        step = np.full(above.size, max(points[-1] - points[0], 1.0))
+        low = np.full(above.size, points[-1])
+        high = low + step
+        short = high - cFunc(high) < target
+        while short.any():
+            low[short] = high[short]
+            step[short] *= 2
+            high[short] += step[short]
+            short = high - cFunc(high) < target
+        while np.any(high - low > tol * np.maximum(1.0, np.abs(high))):
+            middle = (low + high) / 2
+            short = middle - cFunc(middle) < target
+            low = np.where(short, middle, low)
+            high = np.where(short, high, middle)
+        mNrm[above] = high
+    return mNrm
+
+
+def omega_bar(params, period, constraint_period, levels):
+    """
+    The market resources in the given period above which a constraint in constraint_period no longer affects
+    consumption (omega-bar of the paper), for the consumers with the given parameters, including income risk,
+    plus a constraint at each of the given levels in constraint_period. Returns an array with the shape of
+    levels, -inf where the constraint never binds.
+
+    The consumer without the constraint is solved once, for all levels. In constraint_period the constraint
+    binds below the resources at which that consumer saves exactly the constraint level. In every earlier
+    period it matters below the resources at which that consumer saves just enough to reach the next period's
+    threshold after the worst income shock; above them, consumption is the same with and without it.
+    """
+    from liqconstr.scenario import solve_agents
+
+    p = Parameters(params)
+    cFunc = solve_agents([without_constraint(params, constraint_period)])[0]
+
+    levels = np.asarray(levels, dtype=float)
+    mNrm = resources_saving(cFunc[constraint_period], levels.ravel())
+    for t in reversed(range(period, constraint_period)):
+        PermShkVals, TranShkVals, _ = income_dstn(
+            p.PermShkStd[t],
+            p.PermShkCount,
+            p.TranShkStd[t],
+            p.TranShkCount,
+            p.UnempPrb,
+            p.IncUnemp,
+        )
+        # Next period's resources are Rfree / (PermGroFac PermShk) a + TranShk after each shock node
+        aNrm = np.max(
+            (mNrm[np.newaxis, :] - TranShkVals[:, np.newaxis])
+            * (p.PermGroFac[t] * PermShkVals[:, np.newaxis])
+            / p.Rfree,
+            axis=0,
+        )
+        mNrm = resources_saving(cFunc[t], aNrm)
+    return mNrm.reshape(levels.shape)
+
+
+def omega_bar_surface(
+    params, period, constraint_period, levels, shock_period, TranShkStds
+):
+    """
+    omega_bar for every combination of the constraint levels in constraint_period and the standard deviations
+    of the transitory shocks TranShkStd[shock_period], as an array of shape (len(TranShkStds), len(levels)).
+    Each standard deviation takes one solve.
+    """
+    p = Parameters(params)
+    surface = np.empty((len(TranShkStds), len(levels)))
+    for row, TranShkStd in zip(surface, TranShkStds):
+        TranShkStd_t = list(p.TranShkStd)
+        TranShkStd_t[shock_period] = TranShkStd
+        row[:] = omega_bar(
+            dict(params, TranShkStd=TranShkStd_t), period, constraint_period, levels
+        )
+    return surface
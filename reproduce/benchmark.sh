@@ -0,0 +1,14 @@
+#!/bin/bash
+# Time the figures and the dashboard in the container of reproduce/Dockerfile and write the results, with a
+# fingerprint of the environment, to benchmark.json (or the file given as the first argument). Further
+# arguments go to python -m liqconstr.benchmark, e.g. --cases figure/ --repeat 5.
+set -e
+cd "$(dirname "$0")/.."
+
+output=${1:-benchmark.json}
+shift || true
+
+docker build -t liqconstr-reproduce -f reproduce/Dockerfile .
+docker build -t liqconstr-benchmark -f reproduce/Dockerfile.benchmark .
+docker run --rm --cpus="${BENCHMARK_CPUS:-1}" liqconstr-benchmark "$@" > "$output"
+echo "$output"
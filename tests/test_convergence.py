@@ -0,0 +1,53 @@
+import numpy as np
+
+from liqconstr import convergence
+from liqconstr.convergence import Trial
+
+
+def trial(aXtraCount, work, omega_error, kink_shift):
+    return Trial(
+        "CurrConstrHidesFutKink",
+        {"aXtraCount": aXtraCount, "TranShkCount": 3},
+        work,
+        0.0,
+        omega_error,
+        kink_shift,
+        0.0,
+        omega_error,
+    )
+
+
+def test_kink_losing_trial_is_rejected():
+    lost = trial(24, 1000, 1e-3, np.inf)
+    kept = trial(48, 2000, 1e-2, 1e-2)
+    trials = [lost, kept]
+
+    assert convergence.error(lost) == np.inf
+    assert convergence.pareto(trials) == [kept]
+    assert convergence.fastest(trials, 1.0)["CurrConstrHidesFutKink"] is kept
+
+
+def test_coarse_grid_loses_kink_of_future_constraint():
+    trials = convergence.run(
+        ["CurrConstrHidesFutKink"], convergence.ladder((24, 48), (3,)), repeat=1
+    )
+    coarse, fine = trials
+
+    assert coarse.kink_shift == np.inf
+    assert np.isfinite(fine.kink_shift)
+    assert convergence.pareto(trials) == [fine]
+    assert convergence.fastest(trials, 1.0)["CurrConstrHidesFutKink"] is fine
+
+
+def test_risky_figures_converge_to_reference_with_same_shocks():
+    trials = convergence.run(
+        ["ConsWithWithoutConstrAndRisk"],
+        convergence.ladder((48, 384), (3, 7)),
+        repeat=1,
+    )
+
+    for coarse, fine in zip(trials[:2], trials[2:]):
+        assert fine.settings["TranShkCount"] == coarse.settings["TranShkCount"]
+        assert fine.work > coarse.work
+        assert fine.gap_error < coarse.gap_error
+    assert convergence.fastest(trials, 1e-2)["ConsWithWithoutConstrAndRisk"]
@@ -0,0 +1,6 @@
+from liqconstr import snapshots
+
+
+def test_figures_reproduce_stored_tables():
+    for snapshot in snapshots.check():
+        assert snapshot.ok, "%s: %s" % (snapshot.figure, snapshot.message)